@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.contrib.postgres.search import SearchQuery
 from .models import (
     Account,
     FileUpload,
@@ -18,13 +19,22 @@ class AccountAdmin(admin.ModelAdmin):
 class FileUploadAdmin(admin.ModelAdmin):
     list_display = ('filename', 'account', 'status', 'transaction_count', 'created_at')
     list_filter = ('status', 'account')
+    list_select_related = ('account',)
 
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
     list_display = ('account', 'transaction_date', 'description', 'amount')
     list_filter = ('account', 'category')
+    list_select_related = ('account',)
     search_fields = ('description', 'description_2')
-    
+
+    def get_search_results(self, request, queryset, search_term):
+        """Match against the indexed search_vector instead of ILIKE scans."""
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        query = SearchQuery(search_term, config='english', search_type='websearch')
+        return queryset.filter(search_vector=query), False
+
 @admin.register(LocationClassification)
 class LocationClassificationAdmin(admin.ModelAdmin):
     list_display = ('name', 'type')
@@ -35,6 +45,7 @@ class LocationClassificationAdmin(admin.ModelAdmin):
 class LocationSubClassificationAdmin(admin.ModelAdmin):
     list_display = ('name', 'location_classification')
     list_filter = ('location_classification',)
+    list_select_related = ('location_classification',)
     search_fields = ('name',)
     
 @admin.register(TimeClassification)
@@ -53,4 +64,5 @@ class PersonClassificationAdmin(admin.ModelAdmin):
 class StatementAdmin(admin.ModelAdmin):
     list_display = ('account', 'period_start', 'period_end', 'opening_balance', 'closing_balance')
     list_filter = ('account', 'period_start', 'period_end')
+    list_select_related = ('account',)
     search_fields = ('account__name', 'period_start', 'period_end')
@@ -1,22 +1,191 @@
 import csv
 import io
+import json
+import re
+from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
 from datetime import datetime
+from itertools import islice
+from types import SimpleNamespace
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction as db_transaction
+from django.utils import timezone
+from .models import Transaction
+
+# Typed Transaction fields populated by apply_compiled_schema
+SCHEMA_FIELDS = [
+    "transaction_date", "posted_date", "description", "description_2",
+    "category", "subcategory", "amount",
+]
+SCHEMA_BATCH_SIZE = 1000
+# Characters buffered per read() handed to COPY FROM STDIN
+COPY_CHUNK_CHARS = 64 * 1024
 
 
 def parse_csv(file):
     """
-    Parse an uploaded CSV file.
-    Returns (headers: list[str], rows: list[dict])
+    Open an uploaded CSV file for streaming.
+    Returns (headers: list[str], rows: iterator of dict) — rows are read and
+    decoded lazily, so UnicodeDecodeError/csv.Error may surface while iterating.
+    A file with more than settings.CSV_UPLOAD_MAX_ROWS data rows raises
+    csv.Error once the row after the limit is reached.
     """
-    content = file.read()
-    if isinstance(content, bytes):
-        content = content.decode("utf-8-sig")  # utf-8-sig strips BOM if present
-
-    reader = csv.DictReader(io.StringIO(content))
+    # utf-8-sig strips BOM if present
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
     headers = reader.fieldnames or []
-    rows = [dict(row) for row in reader]
-    return list(headers), rows
+    return list(headers), _limit_rows(reader, settings.CSV_UPLOAD_MAX_ROWS)
+
+
+def _limit_rows(rows, max_rows):
+    for count, row in enumerate(rows, 1):
+        if count > max_rows:
+            raise csv.Error(f"CSV has more than {max_rows} rows.")
+        yield row
+
+
+class _ChunkReader(io.TextIOBase):
+    """Minimal read()-able file over an iterator of str chunks, for COPY FROM STDIN."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buffer = ""
+        # psycopg2 reports read() failures as QueryCanceled; keep the original
+        self.error = None
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                chunk = next(self._chunks, None)
+            except Exception as exc:
+                self.error = exc
+                raise
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def insert_raw_transactions(account, file_upload, rows, schema=None):
+    """
+    Insert one Transaction per CSV row. Rows are streamed, never materialised.
+    When a file_upload_schema is given its typed fields are filled in before
+    the rows are written; otherwise only raw_data is stored, leaving the typed
+    fields for apply_schema_to_transactions. Returns (rows inserted, error
+    messages for rows the schema could not be applied to); those rows are
+    still inserted, with only raw_data set.
+
+    On PostgreSQL the rows are sent with a single COPY FROM STDIN; other
+    backends fall back to batched bulk_create.
+    """
+    compiled = compile_schema(schema) if schema else None
+    typed_fields = SCHEMA_FIELDS if compiled is not None else []
+    errors = []
+
+    def typed_values(row):
+        # apply_compiled_schema only sets attributes, so a bare namespace will do
+        parsed = SimpleNamespace(raw_data=row)
+        try:
+            apply_compiled_schema(parsed, compiled)
+        except Exception as exc:
+            # Leave the row untyped and report it, as apply_schema_to_transactions does
+            errors.append(str(exc))
+            return [None] * len(typed_fields)
+        return [getattr(parsed, name) for name in typed_fields]
+
+    if connection.vendor != "postgresql":
+        count = 0
+        while batch := list(islice(rows, settings.BULK_CREATE_BATCH_SIZE)):
+            # DictReader yields a fresh dict per row, so it is stored as-is
+            Transaction.objects.bulk_create([
+                Transaction(
+                    account=account, file_upload=file_upload, raw_data=row,
+                    **(dict(zip(typed_fields, typed_values(row))) if compiled is not None else {}),
+                )
+                for row in batch
+            ])
+            count += len(batch)
+        return count, errors
+
+    now = _copy_field(timezone.now())
+    prefix = f"{account.pk},{file_upload.pk},"
+    count = 0
+
+    def csv_chunks():
+        nonlocal count
+        lines = []
+        size = 0
+        for row in rows:
+            fields = [_copy_field(json.dumps(row))]
+            if compiled is not None:
+                fields.extend(map(_copy_field, typed_values(row)))
+            line = prefix + ",".join(fields) + f",{now},{now}\n"
+            lines.append(line)
+            size += len(line)
+            count += 1
+            if size >= COPY_CHUNK_CHARS:
+                yield "".join(lines)
+                lines = []
+                size = 0
+        yield "".join(lines)
+
+    table = Transaction._meta.db_table
+    columns = ", ".join(["account_id", "file_upload_id", "raw_data", *typed_fields, "created_at", "updated_at"])
+    reader = _ChunkReader(csv_chunks())
+    with connection.cursor() as cursor:
+        try:
+            # copy_expert bypasses Django's cursor wrapper; translate driver errors
+            with connection.wrap_database_errors:
+                cursor.copy_expert(
+                    f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)",
+                    reader,
+                )
+        except DatabaseError:
+            if reader.error is not None:
+                raise reader.error
+            raise
+    return count, errors
+
+
+def _copy_field(value):
+    """
+    Format one value as a COPY CSV field. None becomes an unquoted empty field,
+    which COPY reads as NULL; everything else is quoted, so an empty string
+    stays an empty string.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        if timezone.is_naive(value):
+            # Same interpretation save() gives naive datetimes under USE_TZ
+            value = timezone.make_aware(value)
+        value = value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%m/%d/%y",
+    "%Y-%m-%dT%H:%M:%S",
+    "%m-%d-%Y",
+    "%d/%m/%Y",
+]
+
+# Leading shape of a date string → the DATE_FORMATS that could match it, in the
+# same priority order, so most values cost one strptime call instead of several.
+_DATE_FORMAT_DISPATCH = [
+    (re.compile(r"\d{4}-"), ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"]),
+    (re.compile(r"\d{1,2}/"), ["%m/%d/%Y", "%m/%d/%y", "%d/%m/%Y"]),
+    (re.compile(r"\d{1,2}-"), ["%m-%d-%Y"]),
+]
 
 
 def _parse_date(value):
@@ -24,14 +193,11 @@ def _parse_date(value):
     if not value or not str(value).strip():
         return None
     value = str(value).strip()
-    formats = [
-        "%Y-%m-%d",
-        "%m/%d/%Y",
-        "%m/%d/%y",
-        "%Y-%m-%dT%H:%M:%S",
-        "%m-%d-%Y",
-        "%d/%m/%Y",
-    ]
+    formats = DATE_FORMATS
+    for pattern, candidates in _DATE_FORMAT_DISPATCH:
+        if pattern.match(value):
+            formats = candidates
+            break
     for fmt in formats:
         try:
             return datetime.strptime(value, fmt)
@@ -40,11 +206,19 @@ def _parse_date(value):
     return None
 
 
+# Thousands separators, currency symbol and spaces removed before Decimal()
+_AMOUNT_STRIP_CHARS = str.maketrans("", "", ",$ ")
+
+
 def _parse_amount(value):
     """Parse an amount string into a Decimal, stripping currency symbols and commas."""
     if value is None:
         return None
-    cleaned = str(value).strip().replace(",", "").replace("$", "").replace(" ", "")
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return Decimal(value)
+    cleaned = str(value).strip().translate(_AMOUNT_STRIP_CHARS)
     if not cleaned:
         return None
     try:
@@ -53,10 +227,25 @@ def _parse_amount(value):
         return None
 
 
-def apply_schema_to_transaction(transaction, schema):
+@dataclass(frozen=True, slots=True)
+class CompiledSchema:
+    """A file_upload_schema resolved once into the CSV columns each field reads."""
+    transaction_date_col: str | None
+    posted_date_col: str | None
+    description_col: str | None
+    description_2_col: str | None
+    category_col: str | None
+    subcategory_col: str | None
+    amount_col: str | None
+    amount_format: str | None
+    split_amount: bool
+    debit_col: str | None
+    credit_col: str | None
+
+
+def compile_schema(schema):
     """
-    Apply a file_upload_schema to a Transaction instance, populating its
-    typed fields from transaction.raw_data, then saving.
+    Resolve a file_upload_schema into a CompiledSchema.
 
     schema shape:
     {
@@ -74,35 +263,52 @@ def apply_schema_to_transaction(transaction, schema):
         "credit_column": "<csv_col>" | null,   # only when amount_column_format is null
     }
     """
-    raw = transaction.raw_data
     mapping = schema.get("schema", {})
     amount_format = schema.get("amount_column_format")
+    return CompiledSchema(
+        transaction_date_col=mapping.get("transaction_date") or None,
+        posted_date_col=mapping.get("posted_date") or None,
+        description_col=mapping.get("description") or None,
+        description_2_col=mapping.get("description_2") or None,
+        category_col=mapping.get("category") or None,
+        subcategory_col=mapping.get("subcategory") or None,
+        amount_col=mapping.get("amount") or None,
+        amount_format=amount_format,
+        split_amount=amount_format not in ("debit_is_negative", "debit_is_positive"),
+        debit_col=schema.get("debit_column") or None,
+        credit_col=schema.get("credit_column") or None,
+    )
 
-    def get_raw(field_name):
-        col = mapping.get(field_name)
-        if col and col in raw:
-            return raw[col]
-        return None
 
-    transaction.transaction_date = _parse_date(get_raw("transaction_date"))
-    transaction.posted_date = _parse_date(get_raw("posted_date"))
+def apply_compiled_schema(transaction, compiled):
+    """
+    Populate a Transaction's typed fields from transaction.raw_data using a
+    CompiledSchema. The instance is not saved.
+    """
+    raw = transaction.raw_data
+    # Unmapped columns are None; guard rather than look up raw[None], which is
+    # where DictReader puts any extra values on an over-long row.
+    get = raw.get
+
+    transaction.transaction_date = _parse_date(get(compiled.transaction_date_col)) if compiled.transaction_date_col else None
+    transaction.posted_date = _parse_date(get(compiled.posted_date_col)) if compiled.posted_date_col else None
 
-    desc = get_raw("description")
+    desc = get(compiled.description_col) if compiled.description_col else None
     transaction.description = str(desc).strip() if desc else None
 
-    desc2 = get_raw("description_2")
+    desc2 = get(compiled.description_2_col) if compiled.description_2_col else None
     transaction.description_2 = str(desc2).strip() if desc2 else None
 
-    cat = get_raw("category")
+    cat = get(compiled.category_col) if compiled.category_col else None
     transaction.category = str(cat).strip() if cat else None
 
-    subcat = get_raw("subcategory")
+    subcat = get(compiled.subcategory_col) if compiled.subcategory_col else None
     transaction.subcategory = str(subcat).strip() if subcat else None
 
-    if amount_format in ("debit_is_negative", "debit_is_positive"):
-        raw_amount = _parse_amount(get_raw("amount"))
+    if not compiled.split_amount:
+        raw_amount = _parse_amount(get(compiled.amount_col)) if compiled.amount_col else None
         if raw_amount is not None:
-            if amount_format == "debit_is_negative":
+            if compiled.amount_format == "debit_is_negative":
                 # negative value = debit/expense, stored as-is
                 transaction.amount = raw_amount
             else:
@@ -112,11 +318,8 @@ def apply_schema_to_transaction(transaction, schema):
             transaction.amount = None
     else:
         # Split columns: debit and credit are separate
-        debit_col = schema.get("debit_column")
-        credit_col = schema.get("credit_column")
-
-        debit_val = _parse_amount(raw.get(debit_col)) if debit_col and debit_col in raw else None
-        credit_val = _parse_amount(raw.get(credit_col)) if credit_col and credit_col in raw else None
+        debit_val = _parse_amount(get(compiled.debit_col)) if compiled.debit_col else None
+        credit_val = _parse_amount(get(compiled.credit_col)) if compiled.credit_col else None
 
         if debit_val is not None and credit_val is not None:
             # Net: credits are positive, debits are negative
@@ -128,4 +331,106 @@ def apply_schema_to_transaction(transaction, schema):
         else:
             transaction.amount = None
 
-    transaction.save()
+
+def apply_schema_to_transaction(transaction, schema):
+    """
+    Apply a file_upload_schema (see compile_schema for its shape) to a
+    Transaction instance, populating its typed fields from
+    transaction.raw_data. The instance is not saved.
+    """
+    apply_compiled_schema(transaction, compile_schema(schema))
+
+
+def apply_schema_to_transactions(queryset, schema):
+    """
+    Apply a file_upload_schema to every Transaction in queryset, persisting
+    the typed fields in a single transaction. Returns a list of error messages
+    for rows the schema could not be applied to.
+
+    On PostgreSQL the typed values are COPYed into a temporary table and
+    written with one UPDATE ... FROM join; other backends use batched
+    bulk_update calls, whose CASE WHEN statements grow with every row.
+    """
+    # bulk_update skips auto_now, so stamp updated_at the way save() would
+    update_fields = SCHEMA_FIELDS + ["updated_at"]
+    now = timezone.now()
+    errors = []
+    updates = []
+    compiled = compile_schema(schema)
+    use_copy = connection.vendor == "postgresql"
+    with db_transaction.atomic():
+        if use_copy:
+            staging = _SchemaUpdateStaging(now)
+
+        def flush(updates):
+            if use_copy:
+                staging.copy(updates)
+            else:
+                Transaction.objects.bulk_update(updates, update_fields)
+
+        # Only raw_data is read, so rows come back as (id, raw_data) pairs; a
+        # deferred model queryset would lazily load any FK a related manager
+        # (file_upload.transactions) attaches, one query per row
+        rows = queryset.values_list("id", "raw_data").iterator(chunk_size=SCHEMA_BATCH_SIZE)
+        for pk, raw_data in rows:
+            txn = Transaction(pk=pk, raw_data=raw_data)
+            try:
+                apply_compiled_schema(txn, compiled)
+            except Exception as exc:
+                errors.append(str(exc))
+                continue
+            txn.updated_at = now
+            updates.append(txn)
+            if len(updates) >= SCHEMA_BATCH_SIZE:
+                flush(updates)
+                updates = []
+        if updates:
+            flush(updates)
+        if use_copy:
+            staging.apply()
+    return errors
+
+
+class _SchemaUpdateStaging:
+    """
+    Temporary table holding (id, *SCHEMA_FIELDS) rows for
+    apply_schema_to_transactions. Must be used inside a transaction.
+    """
+
+    def __init__(self, updated_at):
+        quote = connection.ops.quote_name
+        self.updated_at = updated_at
+        self.table = quote(Transaction._meta.db_table)
+        self.name = quote("budget_schema_updates")
+        self.columns = ", ".join(quote(name) for name in ["id", *SCHEMA_FIELDS])
+        with connection.cursor() as cursor:
+            # Same column types as the real table; dropped at commit
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {self.name} ON COMMIT DROP AS "
+                f"SELECT {self.columns} FROM {self.table} WITH NO DATA"
+            )
+
+    def copy(self, transactions):
+        # Each batch is formatted up front: the rows are still being fetched
+        # from a server-side cursor on this same connection, so COPY cannot
+        # read from that iterator while it runs
+        buffer = io.StringIO("".join(
+            ",".join([_copy_field(txn.pk), *(_copy_field(getattr(txn, name)) for name in SCHEMA_FIELDS)]) + "\n"
+            for txn in transactions
+        ))
+        with connection.cursor() as cursor, connection.wrap_database_errors:
+            cursor.copy_expert(
+                f"COPY {self.name} ({self.columns}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+
+    def apply(self):
+        quote = connection.ops.quote_name
+        assignments = ", ".join(f"{quote(name)} = s.{quote(name)}" for name in SCHEMA_FIELDS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {self.table} AS t SET {assignments}, {quote('updated_at')} = %s "
+                f"FROM {self.name} AS s WHERE t.{quote('id')} = s.{quote('id')}",
+                [self.updated_at],
+            )
+            cursor.execute(f"DROP TABLE {self.name}")
@@ -1,6 +1,6 @@
 from datetime import timedelta
 from django.core.management.base import BaseCommand
-from django.db import transaction as db_transaction
+from django.db.models import F
 from budget.models import Account, Statement
 
 
@@ -52,39 +52,29 @@ class Command(BaseCommand):
             f"Scanning statements ({scope_label}), shifting period_end by {direction} days…"
         )
 
-        qs = Statement.objects.only('id', 'account_id', 'period_end').order_by('id')
+        qs = Statement.objects.all()
         if account_id is not None:
             qs = qs.filter(account_id=account_id)
 
         delta = timedelta(days=days)
-        bulk_updates: list[Statement] = []
 
-        for stmt in qs.iterator(chunk_size=500):
-            new_period_end = stmt.period_end + delta
-            if dry_run:
+        if dry_run:
+            would_update = 0
+            rows = qs.order_by('id').values_list('id', 'account_id', 'period_end')
+            for stmt_id, stmt_account_id, period_end in rows.iterator(chunk_size=5000):
                 self.stdout.write(
-                    f"  WOULD UPDATE  Statement {stmt.id} (account {stmt.account_id}): "
-                    f"period_end {stmt.period_end} → {new_period_end}"
+                    f"  WOULD UPDATE  Statement {stmt_id} (account {stmt_account_id}): "
+                    f"period_end {period_end} → {period_end + delta}"
                 )
-            else:
-                stmt.period_end = new_period_end
-                bulk_updates.append(stmt)
-
-        if dry_run:
+                would_update += 1
             self.stdout.write(self.style.WARNING(
-                f"\nDry run — no changes written. {len(bulk_updates) or qs.count()} "
+                f"\nDry run — no changes written. {would_update} "
                 f"statement(s) would be updated."
             ))
             return
 
-        chunk_size = 500
-        updated = 0
-        with db_transaction.atomic():
-            for i in range(0, len(bulk_updates), chunk_size):
-                chunk = bulk_updates[i:i + chunk_size]
-                Statement.objects.bulk_update(chunk, ['period_end'])
-                updated += len(chunk)
-                self.stdout.write(f"  …{updated} statements updated so far")
+        # A single UPDATE ... SET period_end = period_end + interval, done in the DB
+        updated = qs.update(period_end=F('period_end') + delta)
 
         self.stdout.write(self.style.SUCCESS(
             f"\nDone. {updated} statement(s) updated (period_end shifted by {direction} days)."
@@ -1,8 +1,15 @@
 from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.db import transaction as db_transaction
+from django.db.models import F, Window
+from django.db.models.functions import Lag
 from budget.models import Account, Statement
 
+# Postgres throughput plateaus around a couple of thousand rows per statement
+DEFAULT_BATCH_SIZE = 2000
+# Rows fetched per server-side cursor round trip
+ITERATOR_CHUNK_SIZE = 5000
+
 
 class Command(BaseCommand):
     help = (
@@ -24,10 +31,21 @@ class Command(BaseCommand):
             metavar='ACCOUNT_ID',
             help='Restrict the backfill to a single account (by primary key).',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            metavar='N',
+            help=f'Rows per bulk UPDATE statement (default {DEFAULT_BATCH_SIZE}).',
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         account_id = options.get('account_id')
+        batch_size = options['batch_size']
+
+        if batch_size < 1:
+            raise SystemExit(self.style.ERROR("--batch-size must be at least 1."))
 
         if account_id is not None:
             if not Account.objects.filter(pk=account_id).exists():
@@ -38,58 +56,56 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Scanning statements with no period_start ({scope_label})…")
 
-        # Fetch all statements for the relevant accounts, ordered oldest-first
-        # so we can resolve predecessors in one pass per account.
+        # Resolve each statement's predecessor in SQL with LAG() over the
+        # account's statements, ordered oldest-first. Statements that already
+        # have a period_start are skipped below rather than filtered out here,
+        # since a WHERE clause would also hide them from the window.
         qs = (
             Statement.objects
-            .select_related('account')
+            .annotate(prev_end=Window(
+                Lag('period_end'),
+                partition_by=[F('account_id')],
+                order_by=F('period_end').asc(),
+            ))
             .order_by('account_id', 'period_end')
+            .values_list('id', 'account_id', 'period_start', 'period_end', 'prev_end')
         )
         if account_id is not None:
             qs = qs.filter(account_id=account_id)
 
-        # Group into a dict: account_id → [statements in ascending period_end order]
-        from collections import defaultdict
-        by_account: dict[int, list[Statement]] = defaultdict(list)
-        for stmt in qs.iterator(chunk_size=500):
-            by_account[stmt.account_id].append(stmt)
-
         bulk_updates: list[Statement] = []
         skipped_no_predecessor = 0
         skipped_too_far = 0
 
-        for acct_id, stmts in by_account.items():
-            for i, stmt in enumerate(stmts):
-                if stmt.period_start is not None:
-                    continue  # already has an open date
-
-                if i == 0:
-                    # No predecessor exists for the earliest statement
-                    skipped_no_predecessor += 1
-                    continue
-
-                predecessor = stmts[i - 1]
-                delta = (stmt.period_end - predecessor.period_end).days
-
-                if delta > 32:
-                    skipped_too_far += 1
-                    if dry_run:
-                        self.stdout.write(
-                            f"  SKIP  Statement {stmt.id} (account {acct_id}): "
-                            f"predecessor period_end {predecessor.period_end} is "
-                            f"{delta} days before {stmt.period_end} (> 32)"
-                        )
-                    continue
+        for stmt_id, acct_id, period_start, period_end, prev_end in qs.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+            if period_start is not None:
+                continue  # already has an open date
+
+            if prev_end is None:
+                # No predecessor exists for the earliest statement
+                skipped_no_predecessor += 1
+                continue
 
+            delta = (period_end - prev_end).days
+
+            if delta > 32:
+                skipped_too_far += 1
                 if dry_run:
                     self.stdout.write(
-                        f"  WOULD SET  Statement {stmt.id} (account {acct_id}): "
-                        f"period_start = {predecessor.period_end} "
-                        f"(predecessor period_end, {delta}d gap)"
+                        f"  SKIP  Statement {stmt_id} (account {acct_id}): "
+                        f"predecessor period_end {prev_end} is "
+                        f"{delta} days before {period_end} (> 32)"
                     )
-                else:
-                    stmt.period_start = predecessor.period_end
-                    bulk_updates.append(stmt)
+                continue
+
+            if dry_run:
+                self.stdout.write(
+                    f"  WOULD SET  Statement {stmt_id} (account {acct_id}): "
+                    f"period_start = {prev_end} "
+                    f"(predecessor period_end, {delta}d gap)"
+                )
+            else:
+                bulk_updates.append(Statement(pk=stmt_id, period_start=prev_end))
 
         if dry_run:
             self.stdout.write(self.style.WARNING(
@@ -100,11 +116,10 @@ class Command(BaseCommand):
             ))
             return
 
-        chunk_size = 500
         updated = 0
         with db_transaction.atomic():
-            for i in range(0, len(bulk_updates), chunk_size):
-                chunk = bulk_updates[i:i + chunk_size]
+            for i in range(0, len(bulk_updates), batch_size):
+                chunk = bulk_updates[i:i + batch_size]
                 Statement.objects.bulk_update(chunk, ['period_start'])
                 updated += len(chunk)
                 self.stdout.write(f"  …{updated} statements updated so far")
@@ -1,6 +1,7 @@
 from collections import defaultdict
 from django.core.management.base import BaseCommand
-from django.db import transaction as db_transaction
+from django.db import connection, transaction as db_transaction
+from django.db.models import Count, Q
 from budget.models import Account, LocationClassification, LocationSubClassification, Transaction
 
 
@@ -17,14 +18,11 @@ STANDARD_SIGN_TYPES = {
 
 TRANSFER_CATEGORY = 'N/A'
 
+# Postgres throughput plateaus around a couple of thousand rows per statement
+DEFAULT_BATCH_SIZE = 2000
 
-def infer_type_from_account_and_amount(account_type: str, amount) -> str:
-    if account_type in STANDARD_SIGN_TYPES:
-        if amount is not None and amount > 0:
-            return LocationClassification.TYPE_INCOME
-        return LocationClassification.TYPE_EXPENSE
-    # Unexpected/unknown account type — default to expense
-    return LocationClassification.TYPE_EXPENSE
+# Characters str.strip() removes that Postgres btrim() needs spelled out.
+WHITESPACE_CHARS = ' \t\n\r\x0b\x0c'
 
 
 class Command(BaseCommand):
@@ -47,10 +45,21 @@ class Command(BaseCommand):
             metavar='ACCOUNT_ID',
             help='Restrict the migration to a single account (by primary key).',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            metavar='N',
+            help=f'Rows per bulk INSERT statement (default {DEFAULT_BATCH_SIZE}).',
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         account_id = options.get('account_id')
+        batch_size = options['batch_size']
+
+        if batch_size < 1:
+            raise SystemExit(self.style.ERROR("--batch-size must be at least 1."))
 
         if account_id is not None:
             if not Account.objects.filter(pk=account_id).exists():
@@ -71,27 +80,44 @@ class Command(BaseCommand):
         # { category: set(subcategories) }
         subcats_by_cat: dict[str, set] = defaultdict(set)
 
-        qs = (
-            Transaction.objects
-            .select_related('account')
-            .only('category', 'subcategory', 'amount', 'account__type')
-        )
+        qs = Transaction.objects.exclude(category__isnull=True).exclude(category='')
         if account_id is not None:
             qs = qs.filter(account_id=account_id)
 
-        for tx in qs.iterator(chunk_size=500):
-            cat = (tx.category or '').strip()
+        # Tally sign counts per (category, account) in the DB; the result is
+        # bounded by categories × accounts rather than transactions. Account
+        # types come from a separate lookup so the aggregate needs no join.
+        account_types = dict(Account.objects.values_list('id', 'type'))
+        vote_rows = (
+            qs.order_by()
+            .values('category', 'account_id')
+            .annotate(
+                total=Count('pk'),
+                positive=Count('pk', filter=Q(amount__gt=0)),
+            )
+        )
+
+        for row in vote_rows:
+            cat = row['category'].strip()
             if not cat:
                 continue
 
-            subcat = (tx.subcategory or '').strip() or None
-            subcats_by_cat[cat].add(subcat)
-
             if cat == TRANSFER_CATEGORY:
-                type_votes[cat][LocationClassification.TYPE_TRANSFER] += 1
+                type_votes[cat][LocationClassification.TYPE_TRANSFER] += row['total']
+            elif account_types.get(row['account_id']) in STANDARD_SIGN_TYPES:
+                # Positive amount = income; zero, negative and NULL = expense.
+                if row['positive']:
+                    type_votes[cat][LocationClassification.TYPE_INCOME] += row['positive']
+                if row['total'] - row['positive']:
+                    type_votes[cat][LocationClassification.TYPE_EXPENSE] += row['total'] - row['positive']
             else:
-                t = infer_type_from_account_and_amount(tx.account.type, tx.amount)
-                type_votes[cat][t] += 1
+                # Unexpected/unknown account type — default to expense
+                type_votes[cat][LocationClassification.TYPE_EXPENSE] += row['total']
+
+        for cat, subcat in qs.order_by().values_list('category', 'subcategory').distinct():
+            cat = cat.strip()
+            if cat:
+                subcats_by_cat[cat].add((subcat or '').strip() or None)
 
         self.stdout.write(f"  Found {len(type_votes)} unique categories.")
 
@@ -138,93 +164,121 @@ class Command(BaseCommand):
             return
 
         # ------------------------------------------------------------------
-        # Step 3: get-or-create LocationClassification rows.
+        # Step 3: create missing LocationClassification rows in bulk.
         # If one already exists (by name), use it as-is without updating type.
         # ------------------------------------------------------------------
         self.stdout.write("Creating LocationClassification records…")
 
-        cat_to_lc: dict[str, LocationClassification] = {}
-
         with db_transaction.atomic():
+            cat_to_lc: dict[str, LocationClassification] = {
+                lc.name: lc for lc in LocationClassification.objects.filter(name__in=resolved)
+            }
+            existing_cats = set(cat_to_lc)
+            new_lcs = [
+                LocationClassification(name=cat, type=inferred_type)
+                for cat, inferred_type in resolved.items()
+                if cat not in existing_cats
+            ]
+            if new_lcs:
+                # The unique constraint on name makes ignore_conflicts safe against
+                # rows created concurrently; PKs aren't returned, so re-select.
+                LocationClassification.objects.bulk_create(new_lcs, batch_size=batch_size, ignore_conflicts=True)
+                cat_to_lc = {
+                    lc.name: lc for lc in LocationClassification.objects.filter(name__in=resolved)
+                }
+
             for cat, inferred_type in resolved.items():
-                lc, created = LocationClassification.objects.get_or_create(
-                    name=cat,
-                    defaults={'type': inferred_type},
-                )
-                if created:
+                lc = cat_to_lc[cat]
+                if cat not in existing_cats:
                     self.stdout.write(f"  CREATED [{lc.type}] {lc.name!r}")
                 else:
                     self.stdout.write(
                         f"  EXISTS  [{lc.type}] {lc.name!r}"
                         + (f" (inferred {inferred_type!r}, kept existing)" if lc.type != inferred_type else "")
                     )
-                cat_to_lc[cat] = lc
 
             # ---------------------------------------------------------------
-            # Step 4: get-or-create LocationSubClassification rows.
+            # Step 4: create missing LocationSubClassification rows in bulk.
             # ---------------------------------------------------------------
             self.stdout.write("Creating LocationSubClassification records…")
 
-            pair_to_lsc: dict[tuple[str, str | None], LocationSubClassification | None] = {}
-
-            for cat, subcats in subcats_by_cat.items():
-                lc = cat_to_lc.get(cat)
-                if lc is None:
-                    continue
-                for subcat in subcats:
-                    if subcat is None:
-                        pair_to_lsc[(cat, None)] = None
-                        continue
-                    lsc, created = LocationSubClassification.objects.get_or_create(
-                        location_classification=lc,
-                        name=subcat,
-                    )
-                    if created:
-                        self.stdout.write(f"  CREATED LSC: {lc.name!r} > {lsc.name!r}")
-                    pair_to_lsc[(cat, subcat)] = lsc
+            wanted_pairs: set[tuple[str, str]] = {
+                (cat, subcat)
+                for cat, subcats in subcats_by_cat.items()
+                if cat in cat_to_lc
+                for subcat in subcats
+                if subcat is not None
+            }
+            lc_id_to_cat = {lc.id: cat for cat, lc in cat_to_lc.items()}
+
+            def fetch_lscs():
+                lscs = LocationSubClassification.objects.filter(
+                    location_classification_id__in=lc_id_to_cat,
+                    name__in={subcat for _, subcat in wanted_pairs},
+                )
+                by_pair = {}
+                for lsc in lscs:
+                    pair = (lc_id_to_cat[lsc.location_classification_id], lsc.name)
+                    if pair in wanted_pairs:
+                        by_pair[pair] = lsc
+                return by_pair
+
+            pair_to_lsc: dict[tuple[str, str | None], LocationSubClassification | None] = {
+                (cat, None): None for cat, subcats in subcats_by_cat.items()
+                if cat in cat_to_lc and None in subcats
+            }
+            lscs_by_pair = fetch_lscs()
+            missing_pairs = sorted(wanted_pairs - lscs_by_pair.keys())
+            if missing_pairs:
+                LocationSubClassification.objects.bulk_create(
+                    [
+                        LocationSubClassification(location_classification=cat_to_lc[cat], name=subcat)
+                        for cat, subcat in missing_pairs
+                    ],
+                    batch_size=batch_size,
+                    ignore_conflicts=True,
+                )
+                lscs_by_pair = fetch_lscs()
+            pair_to_lsc.update(lscs_by_pair)
+
+            for cat, subcat in missing_pairs:
+                self.stdout.write(f"  CREATED LSC: {cat_to_lc[cat].name!r} > {subcat!r}")
 
             # ---------------------------------------------------------------
             # Step 5: back-fill FK fields on transactions still missing them.
             # ---------------------------------------------------------------
             self.stdout.write("Back-filling transaction FK fields…")
 
-            bulk_updates = []
+            # One UPDATE … FROM (VALUES …) joins each FK-less transaction to its
+            # (category, subcategory) mapping row, matching on the same stripped
+            # values used to build the mapping above.
+            mapping = [
+                (cat, subcat or '', cat_to_lc[cat].id, lsc.id if lsc is not None else None)
+                for (cat, subcat), lsc in pair_to_lsc.items()
+            ]
             updated = 0
-            chunk_size = 500
 
-            qs = (
-                Transaction.objects
-                .filter(location_classification__isnull=True)
-                .only('id', 'category', 'subcategory')
-            )
-            if account_id is not None:
-                qs = qs.filter(account_id=account_id)
-
-            for tx in qs.iterator(chunk_size=chunk_size):
-                cat = (tx.category or '').strip()
-                if not cat:
-                    continue
-                subcat = (tx.subcategory or '').strip() or None
-
-                tx.location_classification = cat_to_lc.get(cat)
-                tx.location_subclassification = pair_to_lsc.get((cat, subcat))
-                bulk_updates.append(tx)
-
-                if len(bulk_updates) >= chunk_size:
-                    Transaction.objects.bulk_update(
-                        bulk_updates,
-                        ['location_classification', 'location_subclassification'],
-                    )
-                    updated += len(bulk_updates)
-                    bulk_updates = []
-                    self.stdout.write(f"  …{updated} transactions updated so far")
-
-            if bulk_updates:
-                Transaction.objects.bulk_update(
-                    bulk_updates,
-                    ['location_classification', 'location_subclassification'],
-                )
-                updated += len(bulk_updates)
+            if mapping:
+                values_sql = ', '.join(['(%s::text, %s::text, %s::bigint, %s::bigint)'] * len(mapping))
+                params: list = [value for row in mapping for value in row]
+                params += [WHITESPACE_CHARS, WHITESPACE_CHARS]
+
+                sql = f"""
+                    UPDATE {Transaction._meta.db_table} AS t
+                    SET location_classification_id = m.lc_id,
+                        location_subclassification_id = m.lsc_id
+                    FROM (VALUES {values_sql}) AS m(category, subcategory, lc_id, lsc_id)
+                    WHERE t.location_classification_id IS NULL
+                      AND btrim(t.category, %s) = m.category
+                      AND COALESCE(btrim(t.subcategory, %s), '') = m.subcategory
+                """
+                if account_id is not None:
+                    sql += " AND t.account_id = %s"
+                    params.append(account_id)
+
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    updated = cursor.rowcount
 
         self.stdout.write(self.style.SUCCESS(
             f"\nDone. {updated} transaction(s) back-filled."
@@ -0,0 +1,42 @@
+# Generated by Django 6.0.2 on 2026-10-14 14:36
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Keeps search_vector in sync with description/description_2 on every write,
+# including bulk_create/bulk_update and queryset.update(), which skip save().
+CREATE_TRIGGER_SQL = """
+CREATE TRIGGER budget_transaction_search_vector
+BEFORE INSERT OR UPDATE OF description, description_2 ON budget_transaction
+FOR EACH ROW EXECUTE FUNCTION
+tsvector_update_trigger(search_vector, 'pg_catalog.english', description, description_2);
+"""
+
+DROP_TRIGGER_SQL = "DROP TRIGGER IF EXISTS budget_transaction_search_vector ON budget_transaction;"
+
+BACKFILL_SQL = """
+UPDATE budget_transaction
+SET search_vector = to_tsvector('pg_catalog.english', coalesce(description, '') || ' ' || coalesce(description_2, ''));
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0008_transaction_description_trgm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='txn_search_vector_gin'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER_SQL, reverse_sql=DROP_TRIGGER_SQL),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
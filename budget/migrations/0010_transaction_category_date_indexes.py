@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-14 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0009_transaction_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['category'], name='txn_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['transaction_date'], name='txn_transaction_date_idx'),
+        ),
+    ]
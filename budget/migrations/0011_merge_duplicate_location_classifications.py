@@ -0,0 +1,67 @@
+# Generated by Django 6.0.2 on 2026-10-14 15:20
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def merge_duplicate_classifications(apps, schema_editor):
+    """
+    Collapse duplicate LocationClassification names (and, afterwards, duplicate
+    subclassification names under one classification) onto the lowest id so
+    the unique constraints in 0012 can be created. References are re-pointed
+    first. Kept separate from 0012 because Postgres refuses ALTER TABLE while
+    the deferred FK checks from these updates are still pending.
+
+    This rewrites user data and cannot be undone. Duplicates whose types
+    differ would move transactions between report sections, so they abort the
+    migration instead and have to be reconciled by hand.
+    """
+    LocationClassification = apps.get_model('budget', 'LocationClassification')
+    LocationSubClassification = apps.get_model('budget', 'LocationSubClassification')
+    Transaction = apps.get_model('budget', 'Transaction')
+
+    duplicate_names = list(
+        LocationClassification.objects.values('name')
+        .annotate(keep_id=Min('id'), n=Count('id'))
+        .filter(n__gt=1)
+    )
+    conflicts = []
+    for row in duplicate_names:
+        types = dict(LocationClassification.objects.filter(name=row['name']).order_by('id').values_list('id', 'type'))
+        if len(set(types.values())) > 1:
+            conflicts.append(f"{row['name']!r} (" + ", ".join(f"id {pk}: {t}" for pk, t in types.items()) + ")")
+    if conflicts:
+        raise RuntimeError(
+            "Duplicate location classifications have conflicting types; give each a "
+            "distinct name or the same type, then re-run the migration: " + "; ".join(conflicts)
+        )
+
+    for row in duplicate_names:
+        dupes = LocationClassification.objects.filter(name=row['name']).exclude(id=row['keep_id'])
+        Transaction.objects.filter(location_classification__in=dupes).update(location_classification_id=row['keep_id'])
+        LocationSubClassification.objects.filter(location_classification__in=dupes).update(location_classification_id=row['keep_id'])
+        dupes.delete()
+
+    duplicate_subs = (
+        LocationSubClassification.objects.values('location_classification_id', 'name')
+        .annotate(keep_id=Min('id'), n=Count('id'))
+        .filter(n__gt=1)
+    )
+    for row in duplicate_subs:
+        dupes = LocationSubClassification.objects.filter(
+            location_classification_id=row['location_classification_id'],
+            name=row['name'],
+        ).exclude(id=row['keep_id'])
+        Transaction.objects.filter(location_subclassification__in=dupes).update(location_subclassification_id=row['keep_id'])
+        dupes.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0010_transaction_category_date_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_classifications, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-14 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0011_merge_duplicate_location_classifications'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='locationclassification',
+            constraint=models.UniqueConstraint(fields=('name',), name='unique_location_classification_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='locationsubclassification',
+            constraint=models.UniqueConstraint(fields=('location_classification', 'name'), name='unique_location_subclassification_name'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0.2 on 2026-10-14 16:05
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_headers(apps, schema_editor):
+    """
+    Populate headers for existing uploads from the keys of their first
+    transaction's raw_data, which is what the serializer used to compute.
+    """
+    FileUpload = apps.get_model('budget', 'FileUpload')
+    Transaction = apps.get_model('budget', 'Transaction')
+
+    first_raw_data = Subquery(
+        Transaction.objects.filter(file_upload=OuterRef('pk')).order_by('id').values('raw_data')[:1]
+    )
+    uploads = []
+    for upload in FileUpload.objects.annotate(first_raw_data=first_raw_data).iterator(chunk_size=2000):
+        if isinstance(upload.first_raw_data, dict):
+            upload.headers = list(upload.first_raw_data.keys())
+            uploads.append(upload)
+    FileUpload.objects.bulk_update(uploads, ['headers'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0012_location_classification_unique_names'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fileupload',
+            name='headers',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(backfill_headers, migrations.RunPython.noop),
+    ]
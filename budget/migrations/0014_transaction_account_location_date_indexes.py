@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-14 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0013_fileupload_headers'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['account', '-transaction_date'], name='txn_account_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['location_classification', '-transaction_date'], name='txn_location_date_idx'),
+        ),
+    ]
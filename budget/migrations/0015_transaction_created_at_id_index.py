@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-14 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0014_transaction_account_location_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['-created_at', '-id'], name='txn_created_at_id_idx'),
+        ),
+    ]
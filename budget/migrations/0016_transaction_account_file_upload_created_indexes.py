@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-14 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0015_transaction_created_at_id_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['account', '-created_at', '-id'], name='txn_account_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['file_upload', '-created_at', '-id'], name='txn_file_upload_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-14 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0016_transaction_account_file_upload_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['location_classification', '-created_at', '-id'], name='txn_location_created_idx'),
+        ),
+    ]
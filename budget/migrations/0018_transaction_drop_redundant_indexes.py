@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-14 18:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0017_transaction_location_created_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='transaction',
+            name='account',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='transactions', to='budget.account'),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='file_upload',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='transactions', to='budget.fileupload'),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='location_classification',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='transactions', to='budget.locationclassification'),
+        ),
+    ]
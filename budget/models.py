@@ -1,4 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
 
 class Account(models.Model):
     TYPE_CHECKING = 'checking'
@@ -44,6 +47,8 @@ class FileUpload(models.Model):
 
     account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='file_uploads')
     filename = models.CharField(max_length=255)
+    # CSV column names, captured at ingest so serializers needn't read raw_data
+    headers = models.JSONField(default=list, blank=True)
     transaction_count = models.IntegerField(default=0)
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default=STATUS_PROCESSING)
     errors = models.TextField(null=True, blank=True)
@@ -71,6 +76,7 @@ class LocationClassification(models.Model):
 
     class Meta:
         verbose_name_plural = 'location classifications'
+        constraints = [models.UniqueConstraint(fields=['name'], name='unique_location_classification_name')]
 
     def __str__(self):
         return f"[{self.type}] {self.name}"
@@ -84,6 +90,12 @@ class LocationSubClassification(models.Model):
 
     class Meta:
         verbose_name_plural = 'location subclassifications'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['location_classification', 'name'],
+                name='unique_location_subclassification_name',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.location_classification.name} > {self.name}"
@@ -114,8 +126,10 @@ class PersonClassification(models.Model):
 
 
 class Transaction(models.Model):
-    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='transactions')
-    file_upload = models.ForeignKey(FileUpload, on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions')
+    # account, file_upload and location_classification lead composite indexes
+    # below, which also serve plain lookups on the column; no separate FK index
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='transactions', db_index=False)
+    file_upload = models.ForeignKey(FileUpload, on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions', db_index=False)
     transaction_date = models.DateTimeField(null=True, blank=True)
     posted_date = models.DateTimeField(null=True, blank=True)
     description = models.CharField(max_length=255, null=True, blank=True)
@@ -124,13 +138,35 @@ class Transaction(models.Model):
     subcategory = models.CharField(max_length=255, null=True, blank=True)
     amount = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     raw_data = models.JSONField()
-    location_classification = models.ForeignKey(LocationClassification, on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions')
+    location_classification = models.ForeignKey(LocationClassification, on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions', db_index=False)
     location_subclassification = models.ForeignKey(LocationSubClassification, on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions')
     time_classification = models.ForeignKey(TimeClassification, on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions')
     person_classification = models.ForeignKey(PersonClassification, on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions')
+    # Maintained by the budget_transaction_search_vector trigger (see migration 0009)
+    search_vector = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # icontains compiles to UPPER(col::text) LIKE UPPER(%s), so the trigram
+            # index must be on the same expression for the planner to use it
+            GinIndex(OpClass(Upper('description'), name='gin_trgm_ops'), name='txn_description_upper_trgm'),
+            GinIndex(fields=['search_vector'], name='txn_search_vector_gin'),
+            models.Index(fields=['category'], name='txn_category_idx'),
+            models.Index(fields=['transaction_date'], name='txn_transaction_date_idx'),
+            # Per-account and per-classification listings sorted newest first
+            models.Index(fields=['account', '-transaction_date'], name='txn_account_date_idx'),
+            models.Index(fields=['location_classification', '-transaction_date'], name='txn_location_date_idx'),
+            # Default list order, and the key for cursor pagination
+            models.Index(fields=['-created_at', '-id'], name='txn_created_at_id_idx'),
+            # The same order within one account's or one upload's transactions
+            models.Index(fields=['account', '-created_at', '-id'], name='txn_account_created_idx'),
+            models.Index(fields=['file_upload', '-created_at', '-id'], name='txn_file_upload_created_idx'),
+            # ...and within one classification's
+            models.Index(fields=['location_classification', '-created_at', '-id'], name='txn_location_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.account} - {self.transaction_date} - {self.description}"
 
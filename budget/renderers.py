@@ -0,0 +1,29 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class OrjsonRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer that encodes compact responses with orjson.
+
+    Datetimes and anything else orjson doesn't handle natively are handed to
+    DRF's encoder, so the output matches JSONRenderer byte for byte. Indented
+    output (the browsable API, `; indent=N` in Accept) and non-default
+    UNICODE_JSON/COMPACT_JSON settings still go through JSONRenderer.
+    """
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        # Same strict-javascript-subset escaping as JSONRenderer
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -1,5 +1,7 @@
+import copy
+from django.conf import settings
+from django.db import transaction as db_transaction
 from rest_framework import serializers
-from drf_spectacular.utils import extend_schema_field
 from .models import (
     Account,
     FileUpload,
@@ -12,23 +14,83 @@ from .models import (
 )
 
 
-class AccountSerializer(serializers.ModelSerializer):
+# Builds a serializer class's fields once and hands each instance copies, rather
+# than re-running ModelSerializer's model introspection every time. (A comment,
+# not a docstring: drf-spectacular would publish it on every schema component.)
+class CachedFieldsMixin:
+    _fields_cache: dict[type, dict] = {}
+
+    def get_fields(self):
+        cls = type(self)
+        cached = CachedFieldsMixin._fields_cache.get(cls)
+        if cached is None:
+            cached = CachedFieldsMixin._fields_cache[cls] = super().get_fields()
+        # Fields are bound per instance, so each needs its own copy; nested
+        # serializers carry their own field state and are copied deeply.
+        return {
+            name: copy.deepcopy(field) if isinstance(field, serializers.BaseSerializer) else copy.copy(field)
+            for name, field in cached.items()
+        }
+
+
+# When nested under another serializer, renders each instance once per root
+# serializer: a page of transactions repeating the same account or upload reuses
+# one representation instead of rebuilding it for every row.
+class CachedRepresentationMixin:
+    def to_representation(self, instance):
+        if self.parent is None or instance.pk is None:
+            return super().to_representation(instance)
+        cache = self.root.__dict__.setdefault('_nested_representation_cache', {})
+        key = (type(self), instance.pk)
+        if key not in cache:
+            cache[key] = super().to_representation(instance)
+        return cache[key]
+
+
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField that looks each pk up at most once per root
+    serializer, so a many=True payload repeating the same account costs one
+    query rather than one per item. pk_only=True loads just the primary key,
+    for fields whose instance is only ever written back as an id.
+    """
+
+    def __init__(self, pk_only=False, **kwargs):
+        self.pk_only = pk_only
+        super().__init__(**kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        return queryset.only('pk') if self.pk_only else queryset
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool) or not isinstance(data, (int, str)):
+            return super().to_internal_value(data)
+        root = self.root
+        cache = root.__dict__.setdefault('_related_instance_cache', {})
+        key = (self.queryset.model, self.pk_only, str(data))
+        if key not in cache:
+            cache[key] = super().to_internal_value(data)
+        return cache[key]
+
+
+class AccountSerializer(CachedRepresentationMixin, CachedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Account
         fields = '__all__'
 
 
-class FileUploadSerializer(serializers.ModelSerializer):
+class FileUploadSerializer(CachedRepresentationMixin, CachedFieldsMixin, serializers.ModelSerializer):
     # Read: full nested Account object
     account = AccountSerializer(read_only=True)
     # Write: accept an integer account ID
-    account_id = serializers.PrimaryKeyRelatedField(
+    account_id = CachedPrimaryKeyRelatedField(
         queryset=Account.objects.all(),
         source='account',
         write_only=True,
     )
-    # Computed from the first transaction's raw_data keys; always read-only
-    headers = serializers.SerializerMethodField()
+    # Captured from the CSV header row at ingest; always read-only
+    headers = serializers.ListField(child=serializers.CharField(), read_only=True)
 
     class Meta:
         model = FileUpload
@@ -37,15 +99,8 @@ class FileUploadSerializer(serializers.ModelSerializer):
             'transaction_count', 'status', 'errors', 'created_at', 'updated_at',
         ]
 
-    @extend_schema_field(serializers.ListField(child=serializers.CharField()))
-    def get_headers(self, obj):
-        first_txn = obj.transactions.first()
-        if not first_txn:
-            return []
-        return list(first_txn.raw_data.keys())
 
-
-class LocationClassificationSerializer(serializers.ModelSerializer):
+class LocationClassificationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     transaction_count = serializers.IntegerField(read_only=True, default=0)
     subcategory_count = serializers.IntegerField(read_only=True, default=0)
 
@@ -54,11 +109,11 @@ class LocationClassificationSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'type', 'transaction_count', 'subcategory_count', 'created_at', 'updated_at']
 
 
-class LocationSubClassificationSerializer(serializers.ModelSerializer):
+class LocationSubClassificationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     # Read: full nested LocationClassification object
     location_classification = LocationClassificationSerializer(read_only=True)
     # Write: accept an integer ID
-    location_classification_id = serializers.PrimaryKeyRelatedField(
+    location_classification_id = CachedPrimaryKeyRelatedField(
         queryset=LocationClassification.objects.all(),
         source='location_classification',
         write_only=True,
@@ -73,23 +128,34 @@ class LocationSubClassificationSerializer(serializers.ModelSerializer):
         ]
 
 
-class TimeClassificationSerializer(serializers.ModelSerializer):
+class TimeClassificationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = TimeClassification
         fields = '__all__'
 
 
-class PersonClassificationSerializer(serializers.ModelSerializer):
+class PersonClassificationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = PersonClassification
         fields = '__all__'
 
 
-class TransactionSerializer(serializers.ModelSerializer):
+class TransactionListSerializer(serializers.ListSerializer):
+    """Creates a list of validated transactions with batched INSERTs."""
+
+    def create(self, validated_data):
+        with db_transaction.atomic():
+            return Transaction.objects.bulk_create(
+                [Transaction(**attrs) for attrs in validated_data],
+                batch_size=settings.BULK_CREATE_BATCH_SIZE,
+            )
+
+
+class TransactionSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     # Read: full nested Account object
     account = AccountSerializer(read_only=True)
     # Write: accept an integer account ID
-    account_id = serializers.PrimaryKeyRelatedField(
+    account_id = CachedPrimaryKeyRelatedField(
         queryset=Account.objects.all(),
         source='account',
         write_only=True,
@@ -97,7 +163,7 @@ class TransactionSerializer(serializers.ModelSerializer):
     # Read: full nested FileUpload object
     file_upload = FileUploadSerializer(read_only=True)
     # Write: accept an integer file upload ID (optional)
-    file_upload_id = serializers.PrimaryKeyRelatedField(
+    file_upload_id = CachedPrimaryKeyRelatedField(
         queryset=FileUpload.objects.all(),
         source='file_upload',
         write_only=True,
@@ -105,6 +171,9 @@ class TransactionSerializer(serializers.ModelSerializer):
         required=False,
     )
 
+    # Classification FKs render as bare PKs, so validating them needs only the id
+    serializer_related_field = CachedPrimaryKeyRelatedField
+
     class Meta:
         model = Transaction
         fields = [
@@ -115,37 +184,60 @@ class TransactionSerializer(serializers.ModelSerializer):
             'time_classification', 'person_classification',
             'created_at', 'updated_at',
         ]
-
-
-class TransactionBatchUpdateSerializer(serializers.Serializer):
+        extra_kwargs = {
+            'location_classification': {'pk_only': True},
+            'location_subclassification': {'pk_only': True},
+            'time_classification': {'pk_only': True},
+            'person_classification': {'pk_only': True},
+        }
+        list_serializer_class = TransactionListSerializer
+
+    # Transaction has no many-to-many or writable nested fields, so the generic
+    # ModelSerializer bookkeeping can be skipped
+    def create(self, validated_data):
+        return Transaction.objects.create(**validated_data)
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        # Write only the submitted columns, not the whole row (raw_data included)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
+
+
+class TransactionBatchUpdateSerializer(CachedFieldsMixin, serializers.Serializer):
     ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
-    location_classification = serializers.PrimaryKeyRelatedField(
+    location_classification = CachedPrimaryKeyRelatedField(
+        pk_only=True,
         queryset=LocationClassification.objects.all(),
         allow_null=True,
         required=False,
     )
-    location_subclassification = serializers.PrimaryKeyRelatedField(
+    location_subclassification = CachedPrimaryKeyRelatedField(
+        pk_only=True,
         queryset=LocationSubClassification.objects.all(),
         allow_null=True,
         required=False,
     )
-    time_classification = serializers.PrimaryKeyRelatedField(
+    time_classification = CachedPrimaryKeyRelatedField(
+        pk_only=True,
         queryset=TimeClassification.objects.all(),
         allow_null=True,
         required=False,
     )
-    person_classification = serializers.PrimaryKeyRelatedField(
+    person_classification = CachedPrimaryKeyRelatedField(
+        pk_only=True,
         queryset=PersonClassification.objects.all(),
         allow_null=True,
         required=False,
     )
 
 
-class StatementSerializer(serializers.ModelSerializer):
+class StatementSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     # Read: full nested Account object
     account = AccountSerializer(read_only=True)
     # Write: accept an integer account ID
-    account_id = serializers.PrimaryKeyRelatedField(
+    account_id = CachedPrimaryKeyRelatedField(
         queryset=Account.objects.all(),
         source='account',
         write_only=True,
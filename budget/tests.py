@@ -1,3 +1,569 @@
-from django.test import TestCase
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from .models import Account, FileUpload, LocationClassification, LocationSubClassification, Transaction
+
+TRANSACTIONS_URL = "/api/v1/transactions/"
+FILE_UPLOADS_URL = "/api/v1/file-uploads/"
+PAYROLL_SUMMARY_URL = "/api/v1/reports/payroll/summary/"
+CASH_FLOW_MONTHLY_URL = "/api/v1/reports/cash-flow-statement/monthly/"
+
+SCHEMA_FIELDS = (
+    "transaction_date", "posted_date", "description", "description_2",
+    "category", "subcategory", "amount",
+)
+
+UPLOAD_SCHEMA = {
+    "schema": {
+        "transaction_date": "Date",
+        "posted_date": "Posted",
+        "description": "Description",
+        "category": "Category",
+        "amount": "Amount",
+    },
+    "amount_column_format": "debit_is_positive",
+}
+
+# Quoted commas, embedded quotes and newlines, and a non-ASCII character all
+# have to survive the COPY text format
+UPLOAD_CSV = (
+    "Date,Posted,Description,Category,Amount\n"
+    '2025-01-03,01/04/2025, Coffee ,Food,"$1,234.50"\n'
+    '13/02/2025,,"Multi\nline ""quoted"", with comma",Café,-3\n'
+    ",,,,\n"
+)
+
+
+def _csv_file(body, name="upload.csv"):
+    return SimpleUploadedFile(name, body.encode(), content_type="text/csv")
+
+
+def _date(year, month, day, hour=0, minute=0):
+    return datetime(year, month, day, hour, minute, tzinfo=dt_timezone.utc)
+
+
+def _months(totals):
+    """A monthly report's months payload: month number -> total, "0" for months left out."""
+    return {str(m): totals.get(m, "0") for m in range(1, 13)}
+
+
+class TransactionQueryCountTests(APITestCase):
+    """The list and detail views cost a fixed number of queries, however many rows they render."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.accounts = [Account.objects.create(name=f"Account {i}") for i in range(2)]
+        uploads = [FileUpload.objects.create(account=account, filename="f.csv") for account in cls.accounts]
+        cls.location = LocationClassification.objects.create(name="Groceries", type=LocationClassification.TYPE_EXPENSE)
+        Transaction.objects.bulk_create([
+            Transaction(
+                account=cls.accounts[i % 2], file_upload=uploads[i % 2], raw_data={},
+                description=f"Row {i}", amount=Decimal("1.00"), location_classification=cls.location,
+            )
+            for i in range(10)
+        ])
+        cls.transaction = Transaction.objects.first()
+
+    def test_list_page(self):
+        # pg_class estimate lookup (the table is below the threshold), COUNT(*), page
+        with self.assertNumQueries(3):
+            response = self.client.get(TRANSACTIONS_URL, {"page_size": 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 10)
+        self.assertEqual(len(response.json()["results"]), 10)
+
+    def test_filtered_list_page(self):
+        # COUNT(*) and page
+        with self.assertNumQueries(2):
+            response = self.client.get(TRANSACTIONS_URL, {"account": self.accounts[0].pk, "page_size": 10})
+        self.assertEqual(response.json()["count"], 5)
+
+    def test_fast_list_page(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(TRANSACTIONS_URL, {"account": self.accounts[0].pk, "fast": "1"})
+        row = response.json()["results"][0]
+        self.assertEqual(row["account_id"], self.accounts[0].pk)
+        self.assertNotIn("account", row)
+
+    def test_list_without_count(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(TRANSACTIONS_URL, {"include_count": "0", "page_size": 4})
+        self.assertTrue(response.json()["has_next"])
+        self.assertEqual(len(response.json()["results"]), 4)
+
+    def test_detail_get(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f"{TRANSACTIONS_URL}{self.transaction.pk}/")
+        self.assertEqual(response.json()["account"]["id"], self.transaction.account_id)
+
+    def test_detail_patch(self):
+        url = f"{TRANSACTIONS_URL}{self.transaction.pk}/"
+        # Load the row, then a single-column UPDATE
+        with self.assertNumQueries(2):
+            response = self.client.patch(url, {"category": "Dining"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["category"], "Dining")
+        self.assertEqual(response.json(), self.client.get(url).json())
+
+    def test_detail_patch_list_body(self):
+        response = self.client.patch(f"{TRANSACTIONS_URL}{self.transaction.pk}/", [{"category": "x"}], format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class TransactionCursorPaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account = Account.objects.create(name="Checking")
+        Transaction.objects.bulk_create([Transaction(account=account, raw_data={}) for _ in range(5)])
+        # Rows sharing a timestamp are ordered by id
+        Transaction.objects.update(created_at=timezone.now())
+        cls.expected_ids = list(Transaction.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    def test_walks_every_row_once(self):
+        ids = []
+        cursor = ""
+        while cursor is not None:
+            response = self.client.get(TRANSACTIONS_URL, {"cursor": cursor, "page_size": 2})
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertNotIn("count", data)
+            ids.extend(row["id"] for row in data["results"])
+            cursor = data["next_cursor"]
+        self.assertEqual(ids, self.expected_ids)
+
+    def test_include_count(self):
+        response = self.client.get(TRANSACTIONS_URL, {"cursor": "", "include_count": "1"})
+        self.assertEqual(response.json()["count"], 5)
+        self.assertIsNone(response.json()["next_cursor"])
+
+    def test_rejects_bad_cursor_and_other_sorts(self):
+        response = self.client.get(TRANSACTIONS_URL, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(TRANSACTIONS_URL, {"cursor": "", "sort_by": "amount"})
+        self.assertEqual(response.status_code, 400)
+
+
+class DateFilterValidationTests(APITestCase):
+    def test_malformed_dates_are_rejected(self):
+        for value in ("2025-13-01", "2025-02-30", "yesterday"):
+            response = self.client.get(TRANSACTIONS_URL, {"transaction_date_from": value})
+            self.assertEqual(response.status_code, 400, value)
+            self.assertIn("transaction_date_from", response.json())
+
+    def test_last_representable_date(self):
+        # The exclusive end of date_to=9999-12-31 would be past date.max
+        response = self.client.get(TRANSACTIONS_URL, {"transaction_date_to": "9999-12-31"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("transaction_date_to", response.json())
+        response = self.client.get(PAYROLL_SUMMARY_URL, {"date_to": "9999-12-31"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("date_to", response.json())
+        response = self.client.get(PAYROLL_SUMMARY_URL, {"date_from": "9999-12-31"})
+        self.assertEqual(response.status_code, 200)
+
+
+class TransactionEstimatedCountTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.account = Account.objects.create(name="Checking")
+        Transaction.objects.bulk_create([Transaction(account=cls.account, raw_data={}) for _ in range(3)])
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Transaction._meta.db_table}")
+        # Not yet reflected in pg_class.reltuples
+        Transaction.objects.create(account=cls.account, raw_data={})
+        cls.expected_ids = list(Transaction.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    @mock.patch("budget.views.TRANSACTIONS_ESTIMATED_COUNT_THRESHOLD", 1)
+    def test_large_unfiltered_table_reports_estimate(self):
+        # pg_class estimate lookup and page; no COUNT(*)
+        with self.assertNumQueries(2):
+            response = self.client.get(TRANSACTIONS_URL, {"page_size": 1, "page": 3})
+        data = response.json()
+        self.assertEqual(data["estimated_count"], 3)
+        self.assertNotIn("count", data)
+        self.assertNotIn("total_pages", data)
+        self.assertTrue(data["has_next"])
+
+    @mock.patch("budget.views.TRANSACTIONS_ESTIMATED_COUNT_THRESHOLD", 1)
+    def test_pages_past_a_stale_estimate_are_reachable(self):
+        response = self.client.get(TRANSACTIONS_URL, {"page_size": 1, "page": 4})
+        data = response.json()
+        self.assertEqual(data["page"], 4)
+        self.assertEqual([row["id"] for row in data["results"]], self.expected_ids[3:])
+        self.assertFalse(data["has_next"])
+
+    @mock.patch("budget.views.TRANSACTIONS_ESTIMATED_COUNT_THRESHOLD", 1)
+    def test_filtered_list_is_counted(self):
+        response = self.client.get(TRANSACTIONS_URL, {"account": self.account.pk, "page_size": 1})
+        data = response.json()
+        self.assertEqual((data["count"], data["total_pages"]), (4, 4))
+        self.assertNotIn("estimated_count", data)
+
+    def test_small_table_is_counted(self):
+        data = self.client.get(TRANSACTIONS_URL).json()
+        self.assertEqual(data["count"], 4)
+        self.assertNotIn("estimated_count", data)
+
+
+class TransactionBulkCreateTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.account = Account.objects.create(name="Checking")
+
+    def test_list_body_is_one_insert(self):
+        payload = [
+            {"account_id": self.account.pk, "raw_data": {}, "description": f"Row {i}", "amount": "1.50"}
+            for i in range(3)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(TRANSACTIONS_URL, payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([row["description"] for row in response.json()], ["Row 0", "Row 1", "Row 2"])
+        self.assertEqual(Transaction.objects.filter(account=self.account).count(), 3)
+        statements = [query["sql"].split(None, 1)[0].upper() for query in queries.captured_queries]
+        # The repeated account_id is looked up once
+        self.assertEqual(statements.count("SELECT"), 1)
+        self.assertEqual(statements.count("INSERT"), 1)
+
+    def test_invalid_item_creates_nothing(self):
+        payload = [
+            {"account_id": self.account.pk, "raw_data": {}},
+            {"account_id": 0, "raw_data": {}},
+        ]
+        response = self.client.post(TRANSACTIONS_URL, payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_single_object_body(self):
+        response = self.client.post(TRANSACTIONS_URL, {"account_id": self.account.pk, "raw_data": {}}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["account"]["id"], self.account.pk)
+
+
+class FileUploadIngestTests(APITestCase):
+    def _upload(self, account, body=UPLOAD_CSV):
+        return self.client.post(FILE_UPLOADS_URL, {"account_id": account.pk, "file": _csv_file(body)}, format="multipart")
+
+    def _typed_rows(self, file_upload_id):
+        return list(Transaction.objects.filter(file_upload_id=file_upload_id).order_by("id").values_list(*SCHEMA_FIELDS))
+
+    def test_upload_with_schema(self):
+        account = Account.objects.create(name="Checking", file_upload_schema=UPLOAD_SCHEMA)
+        response = self._upload(account)
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data["status"], FileUpload.STATUS_COMPLETED)
+        self.assertEqual(data["transaction_count"], 3)
+        self.assertEqual(data["headers"], ["Date", "Posted", "Description", "Category", "Amount"])
+
+        rows = self._typed_rows(data["id"])
+        self.assertEqual(rows, [
+            (
+                datetime(2025, 1, 3, tzinfo=dt_timezone.utc), datetime(2025, 1, 4, tzinfo=dt_timezone.utc),
+                "Coffee", None, "Food", None, Decimal("-1234.50"),
+            ),
+            (
+                datetime(2025, 2, 13, tzinfo=dt_timezone.utc), None,
+                'Multi\nline "quoted", with comma', None, "Café", None, Decimal("3.00"),
+            ),
+            (None, None, None, None, None, None, None),
+        ])
+        raw = Transaction.objects.filter(file_upload_id=data["id"]).order_by("id").values_list("raw_data", flat=True)
+        self.assertEqual(raw[1]["Description"], 'Multi\nline "quoted", with comma')
+
+        # Re-processing applies the same schema and leaves every row unchanged
+        response = self.client.post(f"{FILE_UPLOADS_URL}{data['id']}/process/")
+        self.assertEqual(response.json()["status"], FileUpload.STATUS_COMPLETED)
+        self.assertEqual(self._typed_rows(data["id"]), rows)
+
+    def test_upload_without_schema_stores_raw_rows(self):
+        account = Account.objects.create(name="Checking")
+        response = self._upload(account)
+        data = response.json()
+        self.assertEqual(data["status"], FileUpload.STATUS_PENDING)
+        self.assertEqual(data["transaction_count"], 3)
+        self.assertFalse(Transaction.objects.filter(file_upload_id=data["id"], description__isnull=False).exists())
+
+        account.file_upload_schema = UPLOAD_SCHEMA
+        account.save()
+        response = self.client.post(f"{FILE_UPLOADS_URL}{data['id']}/process/")
+        self.assertEqual(response.json()["status"], FileUpload.STATUS_COMPLETED)
+        self.assertEqual(
+            list(Transaction.objects.filter(file_upload_id=data["id"]).order_by("id").values_list("description", flat=True)),
+            ["Coffee", 'Multi\nline "quoted", with comma', None],
+        )
+
+    @override_settings(BULK_CREATE_BATCH_SIZE=2)
+    def test_upload_on_other_backends(self):
+        account = Account.objects.create(name="Checking", file_upload_schema=UPLOAD_SCHEMA)
+        copied = self._typed_rows(self._upload(account).json()["id"])
+        with mock.patch.object(connection, "vendor", "sqlite"):
+            data = self._upload(account).json()
+        self.assertEqual(data["transaction_count"], 3)
+        self.assertEqual(self._typed_rows(data["id"]), copied)
+
+    def test_schema_failure_marks_upload_failed(self):
+        account = Account.objects.create(name="Checking", file_upload_schema=UPLOAD_SCHEMA)
+        # Negating a signalling NaN raises InvalidOperation
+        body = "Date,Posted,Description,Category,Amount\n2025-01-03,,ok,,1.00\n2025-01-04,,bad,,sNaN\n"
+        data = self._upload(account, body).json()
+        self.assertEqual(data["status"], FileUpload.STATUS_FAILED)
+        self.assertEqual(data["transaction_count"], 2)
+        self.assertTrue(data["errors"])
+
+        response = self.client.post(f"{FILE_UPLOADS_URL}{data['id']}/process/")
+        self.assertEqual(response.json()["status"], FileUpload.STATUS_FAILED)
+        self.assertEqual(response.json()["errors"], data["errors"])
+
+
+class FileUploadLimitTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.account = Account.objects.create(name="Checking")
+
+    def _upload(self, body):
+        return self.client.post(FILE_UPLOADS_URL, {"account_id": self.account.pk, "file": _csv_file(body)}, format="multipart")
+
+    @override_settings(CSV_UPLOAD_MAX_BYTES=len(UPLOAD_CSV.encode()) - 1)
+    def test_file_over_byte_limit(self):
+        response = self._upload(UPLOAD_CSV)
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(FileUpload.objects.exists())
+
+    @override_settings(CSV_UPLOAD_MAX_BYTES=len(UPLOAD_CSV.encode()))
+    def test_file_at_byte_limit(self):
+        self.assertEqual(self._upload(UPLOAD_CSV).status_code, 201)
+
+    @override_settings(CSV_UPLOAD_MAX_ROWS=2)
+    def test_file_over_row_limit(self):
+        response = self._upload(UPLOAD_CSV)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("more than 2 rows", response.json()["detail"])
+        # The partial upload is rolled back
+        self.assertFalse(FileUpload.objects.exists())
+        self.assertFalse(Transaction.objects.exists())
+
+    @override_settings(CSV_UPLOAD_MAX_ROWS=3)
+    def test_file_at_row_limit(self):
+        response = self._upload(UPLOAD_CSV)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["transaction_count"], 3)
+
+
+class PayrollReportTests(APITestCase):
+    """Full payroll summary payload for a hand-checked fixture."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.payroll = Account.objects.create(name="Payroll", type=Account.TYPE_PAYROLL)
+        cls.checking = Account.objects.create(name="Checking", type=Account.TYPE_CHECKING)
+        cls.savings = Account.objects.create(name="Savings", type=Account.TYPE_SAVINGS)
+        cls.card = Account.objects.create(name="Card", type=Account.TYPE_CREDIT_CARD)
+        cls.salary = LocationClassification.objects.create(name="Salary", type=LocationClassification.TYPE_INCOME)
+        cls.transfer = LocationClassification.objects.create(name="Transfer", type=LocationClassification.TYPE_TRANSFER)
+        cls.taxes = LocationClassification.objects.create(name="Taxes", type=LocationClassification.TYPE_EXPENSE)
+        cls.groceries = LocationClassification.objects.create(name="Groceries", type=LocationClassification.TYPE_EXPENSE)
+
+        rows = [
+            (cls.payroll, _date(2025, 1, 1), "3000.00", cls.salary),
+            # Out of range
+            (cls.payroll, _date(2025, 2, 1), "3000.00", cls.salary),
+            (cls.payroll, _date(2024, 12, 31, 23, 59), "-300.00", cls.taxes),
+            (cls.checking, _date(2025, 2, 1), "-999.00", cls.groceries),
+            # To savings: matched to the closer of the two equal credits
+            (cls.payroll, _date(2025, 1, 2), "-500.00", cls.transfer),
+            (cls.savings, _date(2025, 1, 3), "500.00", cls.transfer),
+            (cls.savings, _date(2025, 1, 20), "500.00", cls.transfer),
+            # To checking: matched, then left out of the section
+            (cls.payroll, _date(2025, 1, 2), "-1000.00", cls.transfer),
+            (cls.checking, _date(2025, 1, 2), "1000.00", cls.transfer),
+            (cls.payroll, _date(2025, 1, 10), "-200.00", cls.transfer),
+            (cls.card, _date(2025, 1, 11), "200.00", cls.transfer),
+            # No matching credit
+            (cls.payroll, _date(2025, 1, 12), "-75.00", cls.transfer),
+            (cls.payroll, _date(2025, 1, 5), "-600.00", cls.taxes),
+            (cls.payroll, _date(2025, 1, 6), "-50.00", None),
+            (cls.checking, _date(2025, 1, 7), "-120.50", cls.groceries),
+            # date_to is inclusive of the whole day
+            (cls.card, _date(2025, 1, 31, 18), "-79.50", cls.groceries),
+            (cls.checking, _date(2025, 1, 9), "-30.00", None),
+            # Unclassified credits are not expenses
+            (cls.checking, _date(2025, 1, 9), "10.00", None),
+        ]
+        Transaction.objects.bulk_create([
+            Transaction(
+                account=account, transaction_date=date, amount=Decimal(amount),
+                location_classification=location, raw_data={},
+            )
+            for account, date, amount, location in rows
+        ])
+
+    def test_summary(self):
+        response = self.client.get(PAYROLL_SUMMARY_URL, {"date_from": "2025-01-01", "date_to": "2025-01-31"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            "date_from": "2025-01-01",
+            "date_to": "2025-01-31",
+            "payroll_total": "3000.00",
+            # 3000.00 - 700.00 - 650.00 - 230.00
+            "net_change": "1420.00",
+            "sections": [
+                {
+                    "type": "transfers",
+                    "label": "Transfers from Payroll",
+                    "total": "-700.00",
+                    "transaction_count": 2,
+                    "categories": [
+                        {"id": self.savings.pk, "name": "Savings", "total": "-500.00", "transaction_count": 1, "percent": "16.67"},
+                        {"id": self.card.pk, "name": "Card", "total": "-200.00", "transaction_count": 1, "percent": "6.67"},
+                    ],
+                    "uncategorized": {"total": "0.00", "transaction_count": 0, "percent": "0.00"},
+                },
+                {
+                    "type": "payroll_expenses",
+                    "label": "Payroll Deductions",
+                    "total": "-650.00",
+                    "transaction_count": 2,
+                    "categories": [
+                        {"id": self.taxes.pk, "name": "Taxes", "total": "-600.00", "transaction_count": 1, "percent": "20.00"},
+                    ],
+                    "uncategorized": {"total": "-50.00", "transaction_count": 1, "percent": "1.67"},
+                },
+                {
+                    "type": "other_expenses",
+                    "label": "Expenses from Other Accounts",
+                    "total": "-230.00",
+                    "transaction_count": 3,
+                    "categories": [
+                        {"id": self.groceries.pk, "name": "Groceries", "total": "-200.00", "transaction_count": 2, "percent": "6.67"},
+                    ],
+                    "uncategorized": {"total": "-30.00", "transaction_count": 1, "percent": "1.00"},
+                },
+            ],
+        })
+
+    def test_summary_without_payroll(self):
+        response = self.client.get(PAYROLL_SUMMARY_URL, {"date_from": "2030-01-01"})
+        self.assertEqual(response.json(), {
+            "date_from": "2030-01-01",
+            "date_to": None,
+            "payroll_total": "0",
+            "net_change": "0",
+            "sections": [
+                {
+                    "type": "transfers",
+                    "label": "Transfers from Payroll",
+                    "total": "0",
+                    "transaction_count": 0,
+                    "categories": [],
+                    "uncategorized": {"total": "0.00", "transaction_count": 0, "percent": "0.00"},
+                },
+                {
+                    "type": "payroll_expenses",
+                    "label": "Payroll Deductions",
+                    "total": "0",
+                    "transaction_count": 0,
+                    "categories": [],
+                    "uncategorized": {"total": "0", "transaction_count": 0, "percent": "0.00"},
+                },
+                {
+                    "type": "other_expenses",
+                    "label": "Expenses from Other Accounts",
+                    "total": "0",
+                    "transaction_count": 0,
+                    "categories": [],
+                    "uncategorized": {"total": "0", "transaction_count": 0, "percent": "0.00"},
+                },
+            ],
+        })
+
+
+class CashFlowMonthlyReportTests(APITestCase):
+    """Full monthly cash flow payload for a hand-checked fixture."""
+
+    @classmethod
+    def setUpTestData(cls):
+        account = Account.objects.create(name="Checking")
+        cls.salary = LocationClassification.objects.create(name="Salary", type=LocationClassification.TYPE_INCOME)
+        cls.base = LocationSubClassification.objects.create(location_classification=cls.salary, name="Base")
+        cls.groceries = LocationClassification.objects.create(name="Groceries", type=LocationClassification.TYPE_EXPENSE)
+        transfer = LocationClassification.objects.create(name="Transfer", type=LocationClassification.TYPE_TRANSFER)
+
+        rows = [
+            (_date(2025, 1, 15), "3000.00", cls.salary, cls.base),
+            (_date(2025, 2, 15), "3000.00", cls.salary, cls.base),
+            (_date(2025, 2, 20), "100.00", cls.salary, None),
+            (_date(2025, 1, 10), "-120.50", cls.groceries, None),
+            (_date(2025, 1, 31, 23, 59), "-79.50", cls.groceries, None),
+            (_date(2025, 3, 1), "-10.00", cls.groceries, None),
+            # Outside the year, a transfer, and unclassified: all left out
+            (_date(2024, 12, 31, 23, 59), "-999.00", cls.groceries, None),
+            (_date(2026, 1, 1), "-999.00", cls.groceries, None),
+            (_date(2025, 2, 1), "-500.00", transfer, None),
+            (_date(2025, 2, 1), "-40.00", None, None),
+        ]
+        Transaction.objects.bulk_create([
+            Transaction(
+                account=account, transaction_date=date, amount=Decimal(amount),
+                location_classification=location, location_subclassification=sub, raw_data={},
+            )
+            for date, amount, location, sub in rows
+        ])
+
+    def test_monthly(self):
+        response = self.client.get(CASH_FLOW_MONTHLY_URL, {"year": 2025})
+        self.assertEqual(response.status_code, 200)
+        revenues = {"months": _months({1: "3000.00", 2: "3100.00"}), "ytd": "6100.00"}
+        expenses = {"months": _months({1: "-200.00", 3: "-10.00"}), "ytd": "-210.00"}
+        self.assertEqual(response.json(), {
+            "year": 2025,
+            "months": ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"],
+            "sections": [
+                {
+                    "type": "income",
+                    "label": "Revenues",
+                    "categories": [
+                        {
+                            "id": self.salary.pk,
+                            "name": "Salary",
+                            "subcategories": [
+                                {"id": self.base.pk, "name": "Base", "months": _months({1: "3000.00", 2: "3000.00"}), "ytd": "6000.00"},
+                                {"id": None, "name": "Uncategorized", "months": _months({2: "100.00"}), "ytd": "100.00"},
+                            ],
+                            **revenues,
+                        },
+                    ],
+                    **revenues,
+                },
+                {
+                    "type": "expense",
+                    "label": "Expenses",
+                    "categories": [
+                        {
+                            "id": self.groceries.pk,
+                            "name": "Groceries",
+                            "subcategories": [
+                                {"id": None, "name": "Uncategorized", **expenses},
+                            ],
+                            **expenses,
+                        },
+                    ],
+                    **expenses,
+                },
+            ],
+            "total_revenues": revenues,
+            "total_expenses": expenses,
+            "net_income": {"months": _months({1: "2800.00", 2: "3100.00", 3: "-10.00"}), "ytd": "5890.00"},
+        })
+
+    def test_monthly_requires_integer_year(self):
+        self.assertEqual(self.client.get(CASH_FLOW_MONTHLY_URL).status_code, 400)
+        self.assertEqual(self.client.get(CASH_FLOW_MONTHLY_URL, {"year": "x"}).status_code, 400)
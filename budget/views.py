@@ -1,17 +1,22 @@
+import base64
 import csv
-import io
-from collections import defaultdict
+from datetime import datetime, time, timedelta
 from decimal import Decimal
-from django.db.models import Count, Sum, F as models_F, OuterRef, Subquery
-from django.db.models.functions import TruncMonth
+from django.conf import settings
+from django.db.models import Count, IntegerField, Sum, F as models_F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, TruncMonth
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.core.paginator import Paginator
+from django.db import connection, transaction as db_transaction
 from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer
 from rest_framework import fields as drf_fields
 from .models import (
@@ -35,14 +40,86 @@ from .serializers import (
     PersonClassificationSerializer,
     StatementSerializer,
 )
-from .csv_utils import parse_csv, apply_schema_to_transaction
+from .csv_utils import parse_csv, insert_raw_transactions, apply_schema_to_transactions
 
 TRANSACTIONS_DEFAULT_PAGE_SIZE = 100
+TRANSACTIONS_MAX_PAGE_SIZE = 1000
+# Unfiltered lists of at least this many rows skip COUNT(*) over the whole
+# table: they page like include_count=0 and report the planner's row estimate
+TRANSACTIONS_ESTIMATED_COUNT_THRESHOLD = 100_000
 
-ALLOWED_SORT_FIELDS = {
+ALLOWED_SORT_FIELDS = frozenset({
     "id", "account__name", "transaction_date",
     "description", "amount", "category", "subcategory",
+})
+# Accepted sort_by values (each field, ascending or descending) → order_by()
+TRANSACTION_SORT_ORDERS = {
+    **{field: (field,) for field in ALLOWED_SORT_FIELDS},
+    **{f"-{field}": (f"-{field}",) for field in ALLOWED_SORT_FIELDS},
 }
+# id breaks created_at ties (bulk inserts share a timestamp), which keeps
+# pages stable and lets cursor pagination use the same order
+TRANSACTION_DEFAULT_ORDER = ("-created_at", "-id")
+
+# FKs nested by TransactionSerializer; the classification FKs render as PKs.
+TRANSACTION_SELECT_RELATED = ("account", "file_upload", "file_upload__account")
+
+# Flat columns emitted by `?fast=1`: TransactionSerializer's fields, with the
+# nested account/file_upload objects replaced by their ids.
+TRANSACTION_FAST_FIELDS = (
+    "id", "account_id", "file_upload_id",
+    "transaction_date", "posted_date", "description", "description_2",
+    "category", "subcategory", "amount", "raw_data",
+    "location_classification", "location_subclassification",
+    "time_classification", "person_classification",
+    "created_at", "updated_at",
+)
+TRANSACTION_FAST_DATETIME_FIELDS = ("transaction_date", "posted_date", "created_at", "updated_at")
+
+# Integer query params of the transaction list/export → the FK column each filters
+TRANSACTION_ID_FILTERS = {
+    "account": "account_id",
+    "file_upload": "file_upload_id",
+    "location_classification": "location_classification_id",
+    "location_subclassification": "location_subclassification_id",
+    "time_classification": "time_classification_id",
+    "person_classification": "person_classification_id",
+}
+
+# String query params of the transaction list/export → the lookup each filters
+TRANSACTION_TEXT_FILTERS = {
+    "description": "description__icontains",
+    "account_type": "account__type",
+    "location_classification_type": "location_classification__type",
+}
+
+# CSV export columns: header → value read by values_list()
+TRANSACTION_EXPORT_COLUMNS = (
+    ("ID", "id"),
+    ("Account", "account__name"),
+    ("Transaction Date", "transaction_date"),
+    ("Posted Date", "posted_date"),
+    ("Description", "description"),
+    ("Description 2", "description_2"),
+    ("Category", "category"),
+    ("Subcategory", "subcategory"),
+    ("Amount", "amount"),
+    ("Location Classification", "location_classification__name"),
+    ("Location Subclassification", "location_subclassification__name"),
+    ("Time Classification", "time_classification__name"),
+    ("Person Classification", "person_classification__name"),
+)
+TRANSACTION_EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+TRANSACTION_EXPORT_HEADER = csv.writer(_Echo()).writerow([header for header, _ in TRANSACTION_EXPORT_COLUMNS])
 
 
 class AccountViewSet(viewsets.ModelViewSet):
@@ -51,7 +128,7 @@ class AccountViewSet(viewsets.ModelViewSet):
 
 
 class FileUploadViewSet(viewsets.ModelViewSet):
-    queryset = FileUpload.objects.order_by('id')
+    queryset = FileUpload.objects.select_related('account').order_by('id')
     serializer_class = FileUploadSerializer
 
     def get_parsers(self):
@@ -66,7 +143,8 @@ class FileUploadViewSet(viewsets.ModelViewSet):
           - account_id: account ID (required)
           - file: a CSV file (optional)
         When a file is provided, parses it and creates one Transaction per row.
-        Applies the account schema immediately if one exists.
+        Applies the account schema immediately if one exists. Files over
+        CSV_UPLOAD_MAX_BYTES get a 413; more than CSV_UPLOAD_MAX_ROWS rows, a 400.
         """
         account_id = request.data.get("account_id")
         if not account_id:
@@ -76,6 +154,12 @@ class FileUploadViewSet(viewsets.ModelViewSet):
         file = request.FILES.get("file")
 
         if file:
+            if file.size > settings.CSV_UPLOAD_MAX_BYTES:
+                return Response(
+                    {"detail": f"CSV file is larger than {settings.CSV_UPLOAD_MAX_BYTES} bytes."},
+                    status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                )
+
             try:
                 headers, rows = parse_csv(file)
             except Exception as exc:
@@ -84,25 +168,29 @@ class FileUploadViewSet(viewsets.ModelViewSet):
             has_schema = bool(account.file_upload_schema)
             initial_status = FileUpload.STATUS_COMPLETED if has_schema else FileUpload.STATUS_PENDING
 
-            file_upload = FileUpload.objects.create(
-                account=account,
-                filename=file.name,
-                transaction_count=len(rows),
-                status=initial_status,
-            )
-
-            transactions = []
-            for row in rows:
-                transactions.append(Transaction(
-                    account=account,
-                    file_upload=file_upload,
-                    raw_data=dict(row),
-                ))
-            Transaction.objects.bulk_create(transactions)
-
-            if has_schema:
-                for txn in file_upload.transactions.all():
-                    apply_schema_to_transaction(txn, account.file_upload_schema)
+            try:
+                with db_transaction.atomic():
+                    file_upload = FileUpload.objects.create(
+                        account=account,
+                        filename=file.name,
+                        # Match raw_data's keys: repeated column names collapse
+                        headers=list(dict.fromkeys(headers)),
+                        status=initial_status,
+                    )
+
+                    # The account schema, if any, is applied as the rows are written
+                    transaction_count, errors = insert_raw_transactions(
+                        account, file_upload, rows, account.file_upload_schema or None,
+                    )
+                    file_upload.transaction_count = transaction_count
+                    update_fields = ["transaction_count", "updated_at"]
+                    if errors:
+                        file_upload.status = FileUpload.STATUS_FAILED
+                        file_upload.errors = "\n".join(errors)
+                        update_fields += ["status", "errors"]
+                    file_upload.save(update_fields=update_fields)
+            except (UnicodeDecodeError, csv.Error) as exc:
+                return Response({"detail": f"Failed to parse CSV: {exc}"}, status=status.HTTP_400_BAD_REQUEST)
         else:
             file_upload = FileUpload.objects.create(
                 account=account,
@@ -125,7 +213,7 @@ class FileUploadViewSet(viewsets.ModelViewSet):
         POST /api/v1/file-uploads/{id}/process/
         Re-processes all transactions for this FileUpload using the account schema.
         """
-        file_upload = get_object_or_404(FileUpload, pk=pk)
+        file_upload = get_object_or_404(FileUpload.objects.select_related('account'), pk=pk)
         account = file_upload.account
         schema = account.file_upload_schema
 
@@ -138,12 +226,7 @@ class FileUploadViewSet(viewsets.ModelViewSet):
         file_upload.status = FileUpload.STATUS_PROCESSING
         file_upload.save(update_fields=["status"])
 
-        errors = []
-        for txn in file_upload.transactions.all():
-            try:
-                apply_schema_to_transaction(txn, schema)
-            except Exception as exc:
-                errors.append(str(exc))
+        errors = apply_schema_to_transactions(file_upload.transactions.all(), schema)
 
         if errors:
             file_upload.status = FileUpload.STATUS_FAILED
@@ -158,10 +241,31 @@ class FileUploadViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
 
+def _int_param(query_params, name, default=None):
+    """Integer value of query param `name`, or default when absent/empty. Malformed values are a 400."""
+    value = query_params.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: ["A valid integer is required."]})
+
+
+def _count_subquery(model, fk):
+    """
+    Correlated COUNT(*) of `model` rows whose `fk` points at the outer row.
+    Unlike Count() over a join, several of these can be annotated onto one
+    queryset without multiplying each other's rows.
+    """
+    counts = model.objects.filter(**{fk: OuterRef('pk')}).order_by().values(fk).annotate(c=Count('pk')).values('c')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
 class LocationClassificationViewSet(viewsets.ModelViewSet):
     queryset = LocationClassification.objects.annotate(
-        transaction_count=Count('transactions', distinct=True),
-        subcategory_count=Count('location_subclassifications', distinct=True),
+        transaction_count=_count_subquery(Transaction, 'location_classification'),
+        subcategory_count=_count_subquery(LocationSubClassification, 'location_classification'),
     ).order_by('name')
     serializer_class = LocationClassificationSerializer
 
@@ -171,13 +275,16 @@ class LocationSubClassificationViewSet(viewsets.ModelViewSet):
     serializer_class = LocationSubClassificationSerializer
 
     def get_queryset(self):
-        queryset = LocationSubClassification.objects.annotate(
-            transaction_count=Count('transactions', distinct=True),
+        # The nested location_classification is rendered for every row
+        queryset = LocationSubClassification.objects.select_related(
+            'location_classification',
+        ).annotate(
+            transaction_count=_count_subquery(Transaction, 'location_subclassification'),
         ).order_by('name')
 
-        location_classification_id = self.request.query_params.get('location_classification')
-        if location_classification_id:
-            queryset = queryset.filter(location_classification_id=int(location_classification_id))
+        location_classification_id = _int_param(self.request.query_params, 'location_classification')
+        if location_classification_id is not None:
+            queryset = queryset.filter(location_classification_id=location_classification_id)
 
         type_ = self.request.query_params.get('type')
         if type_:
@@ -210,72 +317,132 @@ class PersonClassificationViewSet(viewsets.ModelViewSet):
     serializer_class = PersonClassificationSerializer
 
 
-def _apply_transaction_filters(queryset, query_params):
-    """Apply filter and sort query params to a Transaction queryset."""
-    account_id = query_params.get("account")
-    if account_id:
-        queryset = queryset.filter(account_id=int(account_id))
+def _serialized_transactions():
+    """Transactions loaded with exactly the columns TransactionSerializer reads."""
+    # search_vector is trigger-maintained and never serialized
+    return Transaction.objects.select_related(*TRANSACTION_SELECT_RELATED).defer("search_vector")
 
-    file_upload_id = query_params.get("file_upload")
-    if file_upload_id:
-        queryset = queryset.filter(file_upload_id=int(file_upload_id))
 
-    transaction_date_from = query_params.get("transaction_date_from")
-    if transaction_date_from:
-        queryset = queryset.filter(transaction_date__date__gte=transaction_date_from)
+def _fast_transaction_rows(rows):
+    """
+    Format `.values()` rows the way TransactionSerializer would format the
+    same fields, without building a serializer per row.
+    """
+    datetime_field = drf_fields.DateTimeField()
+    amount_field = drf_fields.DecimalField(max_digits=12, decimal_places=2)
+    for row in rows:
+        for key in TRANSACTION_FAST_DATETIME_FIELDS:
+            if row[key] is not None:
+                row[key] = datetime_field.to_representation(row[key])
+        if row["amount"] is not None:
+            row["amount"] = amount_field.to_representation(row["amount"])
+    return rows
 
-    transaction_date_to = query_params.get("transaction_date_to")
-    if transaction_date_to:
-        queryset = queryset.filter(transaction_date__date__lte=transaction_date_to)
 
-    description = query_params.get("description")
-    if description:
-        queryset = queryset.filter(description__icontains=description)
+def _start_of_day(value, param, days=0):
+    """
+    Aware midnight (current timezone) of an ISO date string, shifted by days.
+    A malformed value is a 400 naming the query param it came from.
+    """
+    try:
+        day = parse_date(value)
+        if day is not None:
+            day += timedelta(days=days)
+    except (ValueError, OverflowError):
+        # Well formed but not a real date (e.g. 2025-02-30), or a date_to of
+        # 9999-12-31, which has no following day to end the range on
+        day = None
+    if day is None:
+        raise ValidationError({param: ["Date has wrong format. Use one of these formats instead: YYYY-MM-DD."]})
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _transaction_date_lookups(date_from, date_to, params=("date_from", "date_to")):
+    """
+    Lookups keeping transactions dated date_from..date_to (inclusive ISO dates,
+    either may be empty); params names the query params they were read from.
+    Written as a half-open timestamp range rather than __date, which casts
+    every row's transaction_date and so can't use an index on it.
+    """
+    lookups = {}
+    if date_from:
+        lookups["transaction_date__gte"] = _start_of_day(date_from, params[0])
+    if date_to:
+        lookups["transaction_date__lt"] = _start_of_day(date_to, params[1], days=1)
+    return lookups
 
-    location_classification_id = query_params.get("location_classification")
-    if location_classification_id:
-        queryset = queryset.filter(location_classification_id=int(location_classification_id))
 
-    location_classification_null = query_params.get("location_classification_null")
-    if location_classification_null == "true":
-        queryset = queryset.filter(location_classification__isnull=True)
+def _filter_transaction_dates(queryset, date_from, date_to):
+    """Keep transactions dated date_from..date_to; see _transaction_date_lookups."""
+    lookups = _transaction_date_lookups(date_from, date_to)
+    return queryset.filter(**lookups) if lookups else queryset
 
-    location_subclassification_id = query_params.get("location_subclassification")
-    if location_subclassification_id:
-        queryset = queryset.filter(location_subclassification_id=int(location_subclassification_id))
 
-    time_classification_id = query_params.get("time_classification")
-    if time_classification_id:
-        queryset = queryset.filter(time_classification_id=int(time_classification_id))
+def _estimated_row_count(queryset):
+    """
+    pg_class.reltuples for an unfiltered queryset whose table holds at least
+    TRANSACTIONS_ESTIMATED_COUNT_THRESHOLD rows, else None. The estimate is
+    only as fresh as the last autovacuum/ANALYZE, so it is reported and never
+    used to bound pages.
+    """
+    query = getattr(queryset, "query", None)
+    if query is None or query.where or connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [query.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if row and row[0] >= TRANSACTIONS_ESTIMATED_COUNT_THRESHOLD:
+        return row[0]
+    return None
 
-    person_classification_id = query_params.get("person_classification")
-    if person_classification_id:
-        queryset = queryset.filter(person_classification_id=int(person_classification_id))
 
-    account_type = query_params.get("account_type")
-    if account_type:
-        queryset = queryset.filter(account__type=account_type)
+def _encode_transaction_cursor(created_at, pk):
+    """Opaque keyset cursor for the row after which the next page starts."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()},{pk}".encode()).decode()
 
-    excluded_account_type = query_params.get("excluded_account_type")
-    if excluded_account_type:
-        queryset = queryset.exclude(account__type=excluded_account_type)
 
-    location_classification_type = query_params.get("location_classification_type")
-    if location_classification_type:
-        queryset = queryset.filter(location_classification__type=location_classification_type)
+def _decode_transaction_cursor(cursor):
+    """Inverse of _encode_transaction_cursor; raises ValueError if malformed."""
+    created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split(",")
+    return datetime.fromisoformat(created_at), int(pk)
+
+
+def _apply_transaction_filters(queryset, query_params):
+    """Apply filter and sort query params to a Transaction queryset."""
+    get = query_params.get
+
+    # Every lookup below is on the row or a forward FK, so they can all go
+    # into one filter() call without changing which rows match
+    filters = {}
+    for param, lookup in TRANSACTION_ID_FILTERS.items():
+        value = _int_param(query_params, param)
+        if value is not None:
+            filters[lookup] = value
+
+    filters.update(_transaction_date_lookups(
+        get("transaction_date_from"), get("transaction_date_to"),
+        params=("transaction_date_from", "transaction_date_to"),
+    ))
+
+    for param, lookup in TRANSACTION_TEXT_FILTERS.items():
+        value = get(param)
+        if value:
+            filters[lookup] = value
 
-    sort_by = query_params.get("sort_by", "-created_at")
-    direction = ""
-    field = sort_by
-    if sort_by.startswith("-"):
-        direction = "-"
-        field = sort_by[1:]
-    if field in ALLOWED_SORT_FIELDS:
-        queryset = queryset.order_by(f"{direction}{field}")
-    else:
-        queryset = queryset.order_by("-created_at")
+    if get("location_classification_null") == "true":
+        filters["location_classification__isnull"] = True
 
-    return queryset
+    if filters:
+        queryset = queryset.filter(**filters)
+
+    excluded_account_type = get("excluded_account_type")
+    if excluded_account_type:
+        queryset = queryset.exclude(account__type=excluded_account_type)
+
+    return queryset.order_by(*TRANSACTION_SORT_ORDERS.get(get("sort_by"), TRANSACTION_DEFAULT_ORDER))
 
 
 class TransactionListView(APIView):
@@ -286,7 +453,7 @@ class TransactionListView(APIView):
         operation_id="transactions_list",
         parameters=[
             OpenApiParameter(name="page", type=int, location="query", required=False, description="Page number (1-indexed)"),
-            OpenApiParameter(name="page_size", type=int, location="query", required=False, description="Items per page"),
+            OpenApiParameter(name="page_size", type=int, location="query", required=False, description=f"Items per page (default {TRANSACTIONS_DEFAULT_PAGE_SIZE}, max {TRANSACTIONS_MAX_PAGE_SIZE})"),
             OpenApiParameter(name="account", type=int, location="query", required=False, description="Filter by account ID"),
             OpenApiParameter(name="file_upload", type=int, location="query", required=False, description="Filter by file upload ID"),
             OpenApiParameter(name="transaction_date_from", type=str, location="query", required=False, description="Filter transactions on or after this date (ISO 8601, e.g. 2025-01-01)"),
@@ -301,6 +468,9 @@ class TransactionListView(APIView):
             OpenApiParameter(name="account_type", type=str, location="query", required=False, description="Filter by account type (e.g. payroll, checking, savings)"),
             OpenApiParameter(name="excluded_account_type", type=str, location="query", required=False, description="Exclude accounts of the given type (e.g. payroll)"),
             OpenApiParameter(name="location_classification_type", type=str, location="query", required=False, description="Filter by location classification type (income, expense, transfer)"),
+            OpenApiParameter(name="fast", type=str, location="query", required=False, description="Pass '1' to return flat rows: account and file_upload are replaced by account_id and file_upload_id"),
+            OpenApiParameter(name="cursor", type=str, location="query", required=False, description="Keyset pagination for the default sort: pass an empty value for the first page, then each response's next_cursor. The response carries results, page_size and next_cursor instead of page numbers"),
+            OpenApiParameter(name="include_count", type=str, location="query", required=False, description="With cursor, pass '1' to also return the total count. Without cursor, pass '0' to skip the count: the response then carries page, page_size, has_next and results. Unfiltered lists of a large table skip it anyway and also carry estimated_count, the planner's approximate row count"),
         ],
         responses=inline_serializer(
             name='PaginatedTransactionList',
@@ -314,27 +484,109 @@ class TransactionListView(APIView):
         ),
     )
     def get(self, request):
-        transactions = _apply_transaction_filters(Transaction.objects.all(), request.query_params)
+        fast = request.query_params.get("fast") == "1"
+        transactions = _apply_transaction_filters(
+            Transaction.objects.values(*TRANSACTION_FAST_FIELDS) if fast else _serialized_transactions(),
+            request.query_params,
+        )
 
-        page_size = int(request.query_params.get("page_size", TRANSACTIONS_DEFAULT_PAGE_SIZE))
-        page_number = int(request.query_params.get("page", 1))
+        page_size = _int_param(request.query_params, "page_size", TRANSACTIONS_DEFAULT_PAGE_SIZE)
+        # Bound per-request work: page_size is client-controlled
+        page_size = min(max(page_size, 1), TRANSACTIONS_MAX_PAGE_SIZE)
+
+        if "cursor" in request.query_params:
+            return self._cursor_page(request, transactions, page_size, fast)
+
+        page_number = _int_param(request.query_params, "page", 1)
+
+        skip_count = request.query_params.get("include_count") == "0"
+        estimated_count = None if skip_count else _estimated_row_count(transactions)
+        if skip_count or estimated_count is not None:
+            # Fetch one extra row to learn whether a next page exists, instead
+            # of counting the whole filtered set
+            page_number = max(page_number, 1)
+            offset = (page_number - 1) * page_size
+            rows = list(transactions[offset:offset + page_size + 1])
+            has_next = len(rows) > page_size
+            rows = rows[:page_size]
+            data = {
+                "page": page_number,
+                "page_size": page_size,
+                "has_next": has_next,
+                "results": _fast_transaction_rows(rows) if fast else TransactionSerializer(rows, many=True).data,
+            }
+            if estimated_count is not None:
+                data["estimated_count"] = estimated_count
+            return Response(data)
 
         paginator = Paginator(transactions, page_size)
         page_obj = paginator.get_page(page_number)
 
-        serializer = TransactionSerializer(page_obj.object_list, many=True)
+        if fast:
+            results = _fast_transaction_rows(list(page_obj.object_list))
+        else:
+            results = TransactionSerializer(page_obj.object_list, many=True).data
 
         return Response({
             "count": paginator.count,
             "total_pages": paginator.num_pages,
             "page": page_obj.number,
             "page_size": page_size,
-            "results": serializer.data,
+            "results": results,
         })
 
-    @extend_schema(operation_id="transactions_create")
+    def _cursor_page(self, request, transactions, page_size, fast):
+        """
+        Keyset pagination on (created_at, id): each page seeks straight past the
+        previous one instead of counting and discarding OFFSET rows.
+        """
+        if request.query_params.get("sort_by", "-created_at") != "-created_at":
+            return Response(
+                {"detail": "cursor pagination only supports the default sort (-created_at)."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cursor = request.query_params["cursor"]
+        if cursor:
+            try:
+                created_at, pk = _decode_transaction_cursor(cursor)
+            except ValueError:
+                return Response({"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+            # The redundant created_at__lte gives the index scan its start point;
+            # the OR alone would only be applied as a filter
+            page = transactions.filter(created_at__lte=created_at).filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+        else:
+            page = transactions
+
+        # One extra row says whether there is a next page, without a COUNT
+        rows = list(page[:page_size + 1])
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            if fast:
+                next_cursor = _encode_transaction_cursor(last["created_at"], last["id"])
+            else:
+                next_cursor = _encode_transaction_cursor(last.created_at, last.id)
+
+        data = {
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "results": _fast_transaction_rows(rows) if fast else TransactionSerializer(rows, many=True).data,
+        }
+        if request.query_params.get("include_count") == "1":
+            data["count"] = transactions.count()
+        return Response(data)
+
+    @extend_schema(
+        operation_id="transactions_create",
+        description="Create one transaction, or pass a JSON list to create many in a single batch.",
+    )
     def post(self, request):
-        serializer = TransactionSerializer(data=request.data)
+        many = isinstance(request.data, list)
+        serializer = TransactionSerializer(data=request.data, many=many)
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -347,13 +599,13 @@ class TransactionDetailView(APIView):
 
     @extend_schema(operation_id="transactions_retrieve")
     def get(self, request, pk):
-        transaction = get_object_or_404(Transaction, pk=pk)
+        transaction = get_object_or_404(_serialized_transactions(), pk=pk)
         serializer = TransactionSerializer(transaction)
         return Response(serializer.data)
 
     @extend_schema(operation_id="transactions_partial_update")
     def patch(self, request, pk):
-        transaction = get_object_or_404(Transaction, pk=pk)
+        transaction = get_object_or_404(_serialized_transactions(), pk=pk)
         serializer = TransactionSerializer(transaction, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
@@ -424,50 +676,24 @@ class TransactionExportView(APIView):
         responses={200: None},
     )
     def get(self, request):
-        transactions = _apply_transaction_filters(
-            Transaction.objects.select_related(
-                "account",
-                "location_classification",
-                "location_subclassification",
-                "time_classification",
-                "person_classification",
-            ),
-            request.query_params,
-        )
-
-        def _name(obj):
-            return obj.name if obj is not None else ""
+        # values_list() joins the names in and skips building model instances
+        rows = _apply_transaction_filters(
+            Transaction.objects.all(), request.query_params,
+        ).values_list(*(field for _, field in TRANSACTION_EXPORT_COLUMNS))
 
         def stream_csv():
-            buffer = io.StringIO()
-            writer = csv.writer(buffer)
-            writer.writerow([
-                "ID", "Account", "Transaction Date", "Posted Date",
-                "Description", "Description 2", "Category", "Subcategory",
-                "Amount", "Location Classification", "Location Subclassification",
-                "Time Classification", "Person Classification",
-            ])
-            yield buffer.getvalue()
-
-            for tx in transactions.iterator():
-                buffer = io.StringIO()
-                writer = csv.writer(buffer)
-                writer.writerow([
-                    tx.id,
-                    tx.account.name if tx.account else "",
-                    tx.transaction_date.isoformat() if tx.transaction_date else "",
-                    tx.posted_date.isoformat() if tx.posted_date else "",
-                    tx.description or "",
-                    tx.description_2 or "",
-                    tx.category or "",
-                    tx.subcategory or "",
-                    tx.amount if tx.amount is not None else "",
-                    _name(tx.location_classification),
-                    _name(tx.location_subclassification),
-                    _name(tx.time_classification),
-                    _name(tx.person_classification),
-                ])
-                yield buffer.getvalue()
+            writer = csv.writer(_Echo())
+            writerow = writer.writerow
+            yield TRANSACTION_EXPORT_HEADER
+
+            # csv.writer already writes None as an empty field
+            for row in rows.iterator(chunk_size=TRANSACTION_EXPORT_CHUNK_SIZE):
+                row = list(row)
+                if row[2] is not None:
+                    row[2] = row[2].isoformat()
+                if row[3] is not None:
+                    row[3] = row[3].isoformat()
+                yield writerow(row)
 
         response = StreamingHttpResponse(stream_csv(), content_type="text/csv")
         response["Content-Disposition"] = 'attachment; filename="transactions.csv"'
@@ -487,9 +713,9 @@ class StatementViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = Statement.objects.select_related('account')
 
-        account_id = self.request.query_params.get('account')
-        if account_id:
-            queryset = queryset.filter(account_id=int(account_id))
+        account_id = _int_param(self.request.query_params, 'account')
+        if account_id is not None:
+            queryset = queryset.filter(account_id=account_id)
 
         date_from = self.request.query_params.get('date_from')
         if date_from:
@@ -532,6 +758,12 @@ class StatementViewSet(viewsets.ModelViewSet):
 # Reports
 # ---------------------------------------------------------------------------
 
+# Display order of grouped report rows: by classification id, then by
+# subclassification id, with unclassified/uncategorized rows last
+REPORT_SUBCATEGORY_ORDER = models_F('sub_id').asc(nulls_last=True)
+REPORT_CATEGORY_ORDER = (models_F('cls_id').asc(nulls_last=True), REPORT_SUBCATEGORY_ORDER)
+
+
 def _build_summary_sections(rows):
     """
     Given aggregated rows of the form:
@@ -543,7 +775,9 @@ def _build_summary_sections(rows):
             'sub_name': str | None,
             'total': Decimal,
         }
-    assemble the two-level hierarchy expected by both report modes.
+    assemble the two-level hierarchy expected by both report modes. Rows
+    must arrive in display order (see REPORT_CATEGORY_ORDER): categories and
+    subcategories are listed in the order they are first seen.
     Returns (sections, total_revenues, total_expenses).
     """
     tree = {}  # type -> {cat_key -> {sub_key -> total}}
@@ -576,10 +810,10 @@ def _build_summary_sections(rows):
         categories = []
         section_total = Decimal('0')
 
-        for cat_key, subs in sorted(tree.get(cls_type, {}).items(), key=lambda x: (x[0][0] is None, x[0][0])):
+        for cat_key, subs in tree.get(cls_type, {}).items():
             cat_total = Decimal('0')
             subcategories = []
-            for sub_key, total in sorted(subs.items(), key=lambda x: (x[0][0] is None, x[0][0])):
+            for sub_key, total in subs.items():
                 subcategories.append({
                     'id': sub_meta[sub_key]['id'],
                     'name': sub_meta[sub_key]['name'],
@@ -644,17 +878,14 @@ class CashFlowStatementViewSet(viewsets.ViewSet):
         """GET /api/v1/reports/cash-flow-statement/summary/"""
         date_from = request.query_params.get('date_from')
         date_to = request.query_params.get('date_to')
-        account_id = request.query_params.get('account')
+        account_id = _int_param(request.query_params, 'account')
 
         qs = Transaction.objects.filter(
             location_classification__type__in=['income', 'expense'],
         )
-        if date_from:
-            qs = qs.filter(transaction_date__date__gte=date_from)
-        if date_to:
-            qs = qs.filter(transaction_date__date__lte=date_to)
-        if account_id:
-            qs = qs.filter(account_id=int(account_id))
+        qs = _filter_transaction_dates(qs, date_from, date_to)
+        if account_id is not None:
+            qs = qs.filter(account_id=account_id)
 
         agg_fields = dict(
             cls_id=models_F('location_classification__id'),
@@ -663,17 +894,14 @@ class CashFlowStatementViewSet(viewsets.ViewSet):
             sub_id=models_F('location_subclassification__id'),
             sub_name=models_F('location_subclassification__name'),
         )
-        rows = list(qs.values(**agg_fields).annotate(total=Sum('amount')))
+        rows = list(qs.values(**agg_fields).annotate(total=Sum('amount')).order_by(*REPORT_CATEGORY_ORDER))
 
-        if account_id:
+        if account_id is not None:
             transfer_qs = Transaction.objects.filter(
                 location_classification__type=LocationClassification.TYPE_TRANSFER,
-                account_id=int(account_id),
+                account_id=account_id,
             )
-            if date_from:
-                transfer_qs = transfer_qs.filter(transaction_date__date__gte=date_from)
-            if date_to:
-                transfer_qs = transfer_qs.filter(transaction_date__date__lte=date_to)
+            transfer_qs = _filter_transaction_dates(transfer_qs, date_from, date_to)
 
             transfer_agg = dict(
                 cls_id=models_F('location_classification__id'),
@@ -681,12 +909,15 @@ class CashFlowStatementViewSet(viewsets.ViewSet):
                 sub_id=models_F('location_subclassification__id'),
                 sub_name=models_F('location_subclassification__name'),
             )
-            for row in transfer_qs.filter(amount__gt=0).values(**transfer_agg).annotate(total=Sum('amount')):
+            # Every transfer classification folds into one category, so only
+            # the subcategory order matters
+            transfer_qs = transfer_qs.values(**transfer_agg).annotate(total=Sum('amount')).order_by(REPORT_SUBCATEGORY_ORDER)
+            for row in transfer_qs.filter(amount__gt=0):
                 row['cls_type'] = 'income'
                 row['cls_name'] = 'Transfers In'
                 row['cls_id'] = None
                 rows.append(row)
-            for row in transfer_qs.filter(amount__lt=0).values(**transfer_agg).annotate(total=Sum('amount')):
+            for row in transfer_qs.filter(amount__lt=0):
                 row['cls_type'] = 'expense'
                 row['cls_name'] = 'Transfers Out'
                 row['cls_id'] = None
@@ -750,12 +981,14 @@ class CashFlowStatementViewSet(viewsets.ViewSet):
             cls_type=models_F('location_classification__type'),
             sub_id=models_F('location_subclassification__id'),
             sub_name=models_F('location_subclassification__name'),
-        ).annotate(total=Sum('amount'))
+        ).annotate(total=Sum('amount')).order_by(*REPORT_CATEGORY_ORDER)
 
-        # Pivot: (cls_type, cat_key, sub_key) -> month_index -> total
-        pivot = defaultdict(lambda: defaultdict(Decimal))
-        cat_meta = {}
-        sub_meta = {}
+        # One pass over the grouped rows accumulates the subcategory, category
+        # and section totals together. Month dicts are sparse (month_index ->
+        # total); months with no rows read back as 0.
+        section_defs = [('income', 'Revenues'), ('expense', 'Expenses')]
+        section_cats = {cls_type: {} for cls_type, _ in section_defs}
+        section_totals = {cls_type: {} for cls_type, _ in section_defs}
 
         for row in raw_rows:
             cls_type = row['cls_type'] or 'expense'
@@ -764,14 +997,17 @@ class CashFlowStatementViewSet(viewsets.ViewSet):
             month_idx = row['month'].month  # 1-12
             total = row['total'] or Decimal('0')
 
-            pivot_key = (cls_type, cat_key, sub_key)
-            pivot[pivot_key][month_idx] += total
+            cats = section_cats[cls_type]
+            cat = cats.get(cat_key)
+            if cat is None:
+                cat = cats[cat_key] = {'subs': {}, 'months': {}}
+            cat_months = cat['months']
+            sub_months = cat['subs'].setdefault(sub_key, {})
+            section_months = section_totals[cls_type]
 
-            cat_meta[cat_key] = {'id': row['cls_id'], 'name': cat_key[1], 'type': cls_type}
-            sub_meta[sub_key] = {'id': row['sub_id'], 'name': sub_key[1]}
-
-        def zero_months():
-            return {m: Decimal('0') for m in range(1, 13)}
+            sub_months[month_idx] = sub_months.get(month_idx, Decimal('0')) + total
+            cat_months[month_idx] = cat_months.get(month_idx, Decimal('0')) + total
+            section_months[month_idx] = section_months.get(month_idx, Decimal('0')) + total
 
         def months_to_response(month_dict):
             return {str(m): str(month_dict.get(m, Decimal('0'))) for m in range(1, 13)}
@@ -781,44 +1017,27 @@ class CashFlowStatementViewSet(viewsets.ViewSet):
 
         # Build sections
         sections = []
-        section_defs = [('income', 'Revenues'), ('expense', 'Expenses')]
-        total_rev_months = zero_months()
-        total_exp_months = zero_months()
-
         for cls_type, label in section_defs:
-            # Collect categories for this section
-            cats_map = defaultdict(lambda: {'subs': {}, 'months': zero_months()})
-
-            for (pt, cat_key, sub_key), month_totals in pivot.items():
-                if pt != cls_type:
-                    continue
-                for m, total in month_totals.items():
-                    cats_map[cat_key]['months'][m] += total
-                    cats_map[cat_key]['subs'].setdefault(sub_key, zero_months())
-                    cats_map[cat_key]['subs'][sub_key][m] += total
-
-            section_months = zero_months()
             categories = []
-            for cat_key, cat_data in sorted(cats_map.items(), key=lambda x: (x[0][0] is None, x[0][0])):
-                sub_list = []
-                for sub_key, sub_months in sorted(cat_data['subs'].items(), key=lambda x: (x[0][0] is None, x[0][0])):
-                    sub_list.append({
-                        'id': sub_meta[sub_key]['id'],
-                        'name': sub_meta[sub_key]['name'],
+            for cat_key, cat_data in section_cats[cls_type].items():
+                sub_list = [
+                    {
+                        'id': sub_key[0],
+                        'name': sub_key[1],
                         'months': months_to_response(sub_months),
                         'ytd': ytd(sub_months),
-                    })
-                cat_months = cat_data['months']
+                    }
+                    for sub_key, sub_months in cat_data['subs'].items()
+                ]
                 categories.append({
-                    'id': cat_meta[cat_key]['id'],
-                    'name': cat_meta[cat_key]['name'],
+                    'id': cat_key[0],
+                    'name': cat_key[1],
                     'subcategories': sub_list,
-                    'months': months_to_response(cat_months),
-                    'ytd': ytd(cat_months),
+                    'months': months_to_response(cat_data['months']),
+                    'ytd': ytd(cat_data['months']),
                 })
-                for m, v in cat_months.items():
-                    section_months[m] += v
 
+            section_months = section_totals[cls_type]
             sections.append({
                 'type': cls_type,
                 'label': label,
@@ -827,14 +1046,12 @@ class CashFlowStatementViewSet(viewsets.ViewSet):
                 'ytd': ytd(section_months),
             })
 
-            if cls_type == 'income':
-                for m, v in section_months.items():
-                    total_rev_months[m] += v
-            elif cls_type == 'expense':
-                for m, v in section_months.items():
-                    total_exp_months[m] += v
-
-        net_months = {m: total_rev_months[m] + total_exp_months[m] for m in range(1, 13)}
+        total_rev_months = section_totals['income']
+        total_exp_months = section_totals['expense']
+        net_months = {
+            m: total_rev_months.get(m, Decimal('0')) + total_exp_months.get(m, Decimal('0'))
+            for m in range(1, 13)
+        }
 
         return Response({
             'year': year,
@@ -891,19 +1108,20 @@ class StatementReconciliationViewSet(viewsets.ViewSet):
                 return Response({'detail': 'year must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
 
         # Annotate each statement with the sum and count of transactions that fall
-        # within its period and belong to the same account.
+        # within its period and belong to the same account. The period is matched
+        # as [period_start, period_end + 1 day) so transaction_date stays indexable.
         txn_sum_subquery = Subquery(
             Transaction.objects.filter(
                 account=OuterRef('account'),
-                transaction_date__date__gte=OuterRef('period_start'),
-                transaction_date__date__lte=OuterRef('period_end'),
+                transaction_date__gte=OuterRef('period_start'),
+                transaction_date__lt=OuterRef('period_end') + timedelta(days=1),
             ).values('account').annotate(s=Sum('amount')).values('s')[:1]
         )
         txn_count_subquery = Subquery(
             Transaction.objects.filter(
                 account=OuterRef('account'),
-                transaction_date__date__gte=OuterRef('period_start'),
-                transaction_date__date__lte=OuterRef('period_end'),
+                transaction_date__gte=OuterRef('period_start'),
+                transaction_date__lt=OuterRef('period_end') + timedelta(days=1),
             ).values('account').annotate(c=Count('id')).values('c')[:1]
         )
 
@@ -1001,16 +1219,12 @@ class IncomeExpenseSummaryViewSet(viewsets.ViewSet):
         """GET /api/v1/reports/income-expense-summary/summary/"""
         date_from = request.query_params.get('date_from')
         date_to = request.query_params.get('date_to')
-        account_id = request.query_params.get('account')
+        account_id = _int_param(request.query_params, 'account')
 
         def _base_qs():
-            qs = Transaction.objects.all()
-            if date_from:
-                qs = qs.filter(transaction_date__date__gte=date_from)
-            if date_to:
-                qs = qs.filter(transaction_date__date__lte=date_to)
-            if account_id:
-                qs = qs.filter(account_id=int(account_id))
+            qs = _filter_transaction_dates(Transaction.objects.all(), date_from, date_to)
+            if account_id is not None:
+                qs = qs.filter(account_id=account_id)
             return qs
 
         # Classified transactions (income or expense)
@@ -1137,11 +1351,7 @@ class PayrollReportViewSet(viewsets.ViewSet):
         )
 
         def _date_filter(qs):
-            if date_from:
-                qs = qs.filter(transaction_date__date__gte=date_from)
-            if date_to:
-                qs = qs.filter(transaction_date__date__lte=date_to)
-            return qs
+            return _filter_transaction_dates(qs, date_from, date_to)
 
         # ---------------------------------------------------------------
         # Payroll total: sum of positive transactions in payroll accounts
@@ -1168,7 +1378,9 @@ class PayrollReportViewSet(viewsets.ViewSet):
                     location_classification__type=LocationClassification.TYPE_TRANSFER,
                     amount__lt=0,
                 )
-            ).select_related('account').order_by('transaction_date')
+            ).select_related('account')
+            .only('id', 'account', 'account__name', 'amount', 'transaction_date')
+            .order_by('transaction_date')
         )
 
         dest_candidates = list(
@@ -1177,7 +1389,9 @@ class PayrollReportViewSet(viewsets.ViewSet):
                     location_classification__type=LocationClassification.TYPE_TRANSFER,
                     amount__gt=0,
                 ).exclude(account_id__in=payroll_account_ids)
-            ).select_related('account').order_by('transaction_date')
+            ).select_related('account')
+            .only('id', 'account', 'account__name', 'amount', 'transaction_date')
+            .order_by('transaction_date')
         )
 
         # For each payroll outgoing transfer, find the best-matching
@@ -46,6 +46,10 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'budget.renderers.OrjsonRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 MIDDLEWARE = [
@@ -99,6 +103,15 @@ DATABASES = {
     }
 }
 
+# Rows per INSERT when transactions are bulk-created (batched POSTs, and CSV
+# ingest on backends without COPY)
+BULK_CREATE_BATCH_SIZE = env.int('BULK_CREATE_BATCH_SIZE', default=1000)
+
+# Largest CSV accepted by POST /api/v1/file-uploads/: file size in bytes
+# (larger files get a 413) and data rows (more rows is a 400)
+CSV_UPLOAD_MAX_BYTES = env.int('CSV_UPLOAD_MAX_BYTES', default=200 * 1024 * 1024)
+CSV_UPLOAD_MAX_ROWS = env.int('CSV_UPLOAD_MAX_ROWS', default=1_000_000)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators